@@ -0,0 +1,59 @@
+r"""
+Applications of sign vectors and elementary vectors.
+
+Importing this package is cheap.
+The utility functions of the submodules are loaded on first access::
+
+    sage: import applications
+    sage: applications.non_negative_vectors
+    <function non_negative_vectors at ...>
+"""
+
+#############################################################################
+#  Copyright (C) 2025                                                       #
+#          Marcus S. Aichmayr (aichmayr@mathematik.uni-kassel.de)           #
+#                                                                           #
+#  Distributed under the terms of the GNU General Public License (GPL)      #
+#  either version 3, or (at your option) any later version                  #
+#                                                                           #
+#  http://www.gnu.org/licenses/                                             #
+#############################################################################
+
+from importlib import import_module
+
+_LAZY_ATTRIBUTES = {
+    "non_negative_vectors": "applications.ecxs_symbolic",
+    "non_negative_vectors_by_assumptions": "applications.ecxs_symbolic",
+    "WorkerPool": "applications.worker_pool",
+    "WorkerPoolClient": "applications.worker_pool",
+    "save_sign_vectors": "applications.binary_format",
+    "load_sign_vectors": "applications.binary_format",
+    "save_circuits": "applications.binary_format",
+    "load_circuits": "applications.binary_format",
+    "canonical_form": "applications.circuit_index",
+    "CircuitIndex": "applications.circuit_index",
+    "SignPatternQuery": "applications.sign_query",
+    "prescreen_cbe": "applications.cbe_prescreen",
+    "canonical_relation": "applications.cbe_conditions",
+    "simplify_conditions": "applications.cbe_conditions",
+    "profile_stages": "applications.profiling",
+    "fuzz": "applications.fuzzing",
+    "aggregate_sign_vectors": "applications.sign_vector_plots",
+    "maximal_minors": "applications.minors",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str):
+    try:
+        module = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
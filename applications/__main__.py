@@ -0,0 +1,22 @@
+r"""
+Run the command-line interface with ``python -m applications``.
+
+.. SEEALSO::
+
+    :mod:`applications.cli`
+"""
+
+#############################################################################
+#  Copyright (C) 2025                                                       #
+#          Marcus S. Aichmayr (aichmayr@mathematik.uni-kassel.de)           #
+#                                                                           #
+#  Distributed under the terms of the GNU General Public License (GPL)      #
+#  either version 3, or (at your option) any later version                  #
+#                                                                           #
+#  http://www.gnu.org/licenses/                                             #
+#############################################################################
+
+from applications.cli import main
+
+if __name__ == "__main__":
+    main()
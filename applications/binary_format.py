@@ -0,0 +1,408 @@
+r"""
+Compact binary files for sign vectors and circuits.
+
+==========================================
+Binary files for sign vectors and circuits
+==========================================
+
+Large sets of sign vectors, for instance the covectors of an oriented matroid,
+are expensive to pickle.
+This module stores them with 2 bits per entry
+and loads them as a :func:`numpy.memmap`.
+Hence, the data can be scanned without decoding all sign vectors.
+
+We store the covectors of an oriented matroid::
+
+    sage: from sign_vectors import *
+    sage: from applications.binary_format import *
+    sage: import os, tempfile
+    sage: directory = tempfile.mkdtemp()
+    sage: om = OrientedMatroid(matrix([[1, 3, -2, 1], [0, 4, -2, 1]]))
+    sage: path = os.path.join(directory, "covectors.svec")
+    sage: save_sign_vectors(path, om.covectors())
+    13
+    sage: covectors = load_sign_vectors(path)
+    sage: covectors
+    13 packed sign vectors of length 4
+    sage: set(covectors) == om.covectors()
+    True
+
+We select the covectors with a positive first and a zero second component
+without decoding the others::
+
+    sage: [covectors[i] for i in covectors.indices(positive=[0], zero=[1])]
+    [(+0-+)]
+
+Circuits with integer entries are stored as an integer array::
+
+    sage: from elementary_vectors import *
+    sage: path = os.path.join(directory, "circuits.circ")
+    sage: save_circuits(path, circuits(matrix([[1, 1, 2, 0], [0, 0, 1, 2]])))
+    3
+    sage: load_circuits(path)
+    memmap([[ 1, -1,  0,  0],
+            [ 4,  0, -2,  1],
+            [ 0,  4, -2,  1]])
+
+File layout
+===========
+
+Both formats start with a header of 32 bytes (little endian):
+
+- a magic number of 4 bytes, ``SVEC`` for sign vectors and ``CIRC`` for circuits,
+- the format version (2 bytes) and 2 reserved bytes,
+- the number of elements (8 bytes),
+- the length of the elements (8 bytes),
+- the number of bytes per element (8 bytes).
+
+For sign vectors of length :math:`n`, each element consists of
+the positive support followed by the negative support,
+each as a bitmask of :math:`\lceil n / 8 \rceil` bytes with bit :math:`e` set if :math:`e` is in the support.
+Storing the supports separately allows testing components with bitwise operations.
+For circuits, each element consists of :math:`n` signed 64-bit integers.
+"""
+
+#############################################################################
+#  Copyright (C) 2025                                                       #
+#          Marcus S. Aichmayr (aichmayr@mathematik.uni-kassel.de)           #
+#                                                                           #
+#  Distributed under the terms of the GNU General Public License (GPL)      #
+#  either version 3, or (at your option) any later version                  #
+#                                                                           #
+#  http://www.gnu.org/licenses/                                             #
+#############################################################################
+
+import os
+import struct
+import tempfile
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from applications.bitsets import sign_vector_from_masks, sign_vector_masks
+
+VERSION = 1
+SIGN_VECTORS_MAGIC = b"SVEC"
+CIRCUITS_MAGIC = b"CIRC"
+
+_HEADER = struct.Struct("<4sHHQQQ")
+HEADER_SIZE = _HEADER.size
+
+
+def _write_elements(path: str, magic: bytes, rows: Iterable[tuple[int, bytes]]) -> int:
+    r"""
+    Write a header and rows ``(length, data)`` to a file and return the number of rows.
+
+    The data is written to a temporary file that replaces ``path`` once all rows are written.
+    Hence, an existing file is kept if writing fails.
+    """
+    count = 0
+    length = 0
+    row_size = 0
+    descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with open(descriptor, "wb") as file:
+            file.write(_HEADER.pack(magic, VERSION, 0, 0, 0, 0))
+            for row_length, data in rows:
+                if count == 0:
+                    length, row_size = row_length, len(data)
+                elif row_length != length:
+                    raise ValueError("elements have different lengths")
+                file.write(data)
+                count += 1
+            file.seek(0)
+            file.write(_HEADER.pack(magic, VERSION, 0, count, length, row_size))
+        os.replace(temporary, path)
+    except BaseException:
+        os.remove(temporary)
+        raise
+    return count
+
+
+def _read_header(path: str, magic: bytes) -> tuple[int, int, int]:
+    with open(path, "rb") as file:
+        header = file.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE:
+        raise ValueError(f"{path!r} is too short for a header")
+    file_magic, version, _, count, length, row_size = _HEADER.unpack(header)
+    if file_magic != magic:
+        raise ValueError(f"{path!r} has magic number {file_magic!r} instead of {magic!r}")
+    if version != VERSION:
+        raise ValueError(f"unsupported format version {version}")
+    return count, length, row_size
+
+
+def save_sign_vectors(path: str, sign_vectors: Iterable) -> int:
+    r"""
+    Write sign vectors to a binary file.
+
+    INPUT:
+
+    - ``path`` -- the path of the file
+
+    - ``sign_vectors`` -- an iterable of sign vectors of the same length;
+      the sign vectors are consumed one by one
+
+    OUTPUT:
+    The number of written sign vectors.
+
+    .. SEEALSO::
+
+        :func:`load_sign_vectors`
+
+    EXAMPLES::
+
+        sage: from sign_vectors import sign_vector
+        sage: from applications.binary_format import save_sign_vectors
+        sage: import os, tempfile
+        sage: path = os.path.join(tempfile.mkdtemp(), "sign_vectors.svec")
+        sage: save_sign_vectors(path, [sign_vector("+-0"), sign_vector("00+")])
+        2
+        sage: save_sign_vectors(path, [sign_vector("+-0"), sign_vector("+")])
+        Traceback (most recent call last):
+        ...
+        ValueError: elements have different lengths
+    """
+    def rows():
+        for X in sign_vectors:
+            size = (len(X) + 7) // 8
+            positive, negative = sign_vector_masks(X)
+            yield len(X), positive.to_bytes(size, "little") + negative.to_bytes(size, "little")
+
+    return _write_elements(path, SIGN_VECTORS_MAGIC, rows())
+
+
+def load_sign_vectors(path: str) -> "PackedSignVectors":
+    r"""
+    Load sign vectors written by :func:`save_sign_vectors`.
+
+    The file is mapped into memory, not read.
+
+    EXAMPLES::
+
+        sage: from sign_vectors import sign_vector
+        sage: from applications.binary_format import save_sign_vectors, load_sign_vectors
+        sage: import os, tempfile
+        sage: path = os.path.join(tempfile.mkdtemp(), "sign_vectors.svec")
+        sage: save_sign_vectors(path, [sign_vector("+-0-+0-+0"), sign_vector("000000000")])
+        2
+        sage: list(load_sign_vectors(path))
+        [(+-0-+0-+0), (000000000)]
+        sage: save_sign_vectors(path, [])
+        0
+        sage: list(load_sign_vectors(path))
+        []
+    """
+    return PackedSignVectors(path)
+
+
+class PackedSignVectors:
+    r"""
+    Sign vectors stored in a binary file.
+
+    INPUT:
+
+    - ``path`` -- the path of a file written by :func:`save_sign_vectors`
+
+    The supports are available as arrays :attr:`positive` and :attr:`negative`
+    of shape ``(len(self), ceil(self.length / 8))`` mapped from the file.
+
+    EXAMPLES::
+
+        sage: from sign_vectors import sign_vector
+        sage: from applications.binary_format import save_sign_vectors, PackedSignVectors
+        sage: import os, tempfile
+        sage: path = os.path.join(tempfile.mkdtemp(), "sign_vectors.svec")
+        sage: save_sign_vectors(path, [sign_vector("+-0"), sign_vector("-00"), sign_vector("00+")])
+        3
+        sage: P = PackedSignVectors(path)
+        sage: P
+        3 packed sign vectors of length 3
+        sage: P[1]
+        (-00)
+        sage: P[-1]
+        (00+)
+        sage: P.masks(0)
+        (1, 2)
+        sage: P.positive
+        memmap([[1],
+                [0],
+                [4]], dtype=uint8)
+    """
+
+    def __init__(self, path: str) -> None:
+        count, length, row_size = _read_header(path, SIGN_VECTORS_MAGIC)
+        self.path = path
+        self.length = length
+        size = row_size // 2
+        if count == 0:
+            self._data = np.zeros((0, row_size), dtype=np.uint8)
+        else:
+            self._data = np.memmap(path, dtype=np.uint8, mode="r", offset=HEADER_SIZE, shape=(count, row_size))
+        self.positive = self._data[:, :size]
+        self.negative = self._data[:, size:]
+
+    def __repr__(self) -> str:
+        return f"{len(self)} packed sign vectors of length {self.length}"
+
+    def __len__(self) -> int:
+        return self._data.shape[0]
+
+    def masks(self, index: int) -> tuple[int, int]:
+        r"""
+        Return the positive and negative support of an element as bitmasks.
+        """
+        return (
+            int.from_bytes(self.positive[index].tobytes(), "little"),
+            int.from_bytes(self.negative[index].tobytes(), "little"),
+        )
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("index out of range")
+        return sign_vector_from_masks(*self.masks(index), self.length)
+
+    def __iter__(self) -> Iterator:
+        for index in range(len(self)):
+            yield self[index]
+
+    def _column(self, array: np.ndarray, e: int) -> np.ndarray:
+        if not 0 <= e < self.length:
+            raise IndexError(f"component {e} out of range")
+        return (array[:, e // 8] >> (e % 8)) & 1 == 1
+
+    def indices(self, positive: Iterable[int] = (), negative: Iterable[int] = (), zero: Iterable[int] = ()) -> np.ndarray:
+        r"""
+        Return the indices of the elements with the given signs.
+
+        INPUT:
+
+        - ``positive`` -- components that need to be positive
+
+        - ``negative`` -- components that need to be negative
+
+        - ``zero`` -- components that need to be zero
+
+        The components are tested on the mapped bitmasks with vectorized operations.
+
+        EXAMPLES::
+
+            sage: from sign_vectors import sign_vector
+            sage: from applications.binary_format import save_sign_vectors, load_sign_vectors
+            sage: import os, tempfile
+            sage: path = os.path.join(tempfile.mkdtemp(), "sign_vectors.svec")
+            sage: save_sign_vectors(path, [sign_vector("+-0"), sign_vector("-00"), sign_vector("+0+")])
+            3
+            sage: P = load_sign_vectors(path)
+            sage: P.indices(positive=[0])
+            array([0, 2])
+            sage: P.indices(zero=[1, 2])
+            array([1])
+            sage: P.indices()
+            array([0, 1, 2])
+            sage: P.indices(negative=[3])
+            Traceback (most recent call last):
+            ...
+            IndexError: component 3 out of range
+        """
+        selected = np.ones(len(self), dtype=bool)
+        for e in positive:
+            selected &= self._column(self.positive, e)
+        for e in negative:
+            selected &= self._column(self.negative, e)
+        for e in zero:
+            selected &= ~(self._column(self.positive, e) | self._column(self.negative, e))
+        return np.flatnonzero(selected)
+
+
+def save_circuits(path: str, circuits: Iterable) -> int:
+    r"""
+    Write vectors with integer entries to a binary file.
+
+    INPUT:
+
+    - ``path`` -- the path of the file
+
+    - ``circuits`` -- an iterable of vectors of the same length
+      whose entries fit into signed 64-bit integers
+
+    OUTPUT:
+    The number of written vectors.
+
+    .. SEEALSO::
+
+        :func:`load_circuits`
+
+    EXAMPLES::
+
+        sage: from applications.binary_format import save_circuits, load_circuits
+        sage: import os, tempfile
+        sage: path = os.path.join(tempfile.mkdtemp(), "circuits.circ")
+        sage: save_circuits(path, [vector([1, -1, 0]), vector(QQ, [2, 0, 1])])
+        2
+        sage: save_circuits(path, [vector([1/2, 1])])
+        Traceback (most recent call last):
+        ...
+        ValueError: entries of (1/2, 1) are not integers
+
+    A failed save keeps the previous file::
+
+        sage: load_circuits(path)
+        memmap([[ 1, -1,  0],
+                [ 2,  0,  1]])
+        sage: os.listdir(os.path.dirname(path))
+        ['circuits.circ']
+        sage: var("mu")
+        mu
+        sage: save_circuits(path, [vector([mu, 1])])
+        Traceback (most recent call last):
+        ...
+        ValueError: entries of (mu, 1) are not integers
+        sage: save_circuits(path, [vector([2^70, 1])])
+        Traceback (most recent call last):
+        ...
+        ValueError: entries of (1180591620717411303424, 1) exceed 64 bits
+    """
+    from sage.rings.integer_ring import ZZ
+
+    def rows():
+        for v in circuits:
+            try:
+                entries = [int(ZZ(x)) for x in v]
+            except (TypeError, ValueError):
+                raise ValueError(f"entries of {v} are not integers") from None
+            try:
+                data = np.array(entries, dtype="<i8").tobytes()
+            except OverflowError:
+                raise ValueError(f"entries of {v} exceed 64 bits") from None
+            yield len(entries), data
+
+    return _write_elements(path, CIRCUITS_MAGIC, rows())
+
+
+def load_circuits(path: str) -> np.ndarray:
+    r"""
+    Load vectors written by :func:`save_circuits`.
+
+    OUTPUT:
+    An integer array mapped from the file with one row per vector.
+
+    EXAMPLES::
+
+        sage: from applications.binary_format import save_circuits, load_circuits
+        sage: import os, tempfile
+        sage: path = os.path.join(tempfile.mkdtemp(), "circuits.circ")
+        sage: save_circuits(path, [vector([1, -1, 0]), vector([2, 0, 1])])
+        2
+        sage: C = load_circuits(path)
+        sage: C.shape
+        (2, 3)
+        sage: C[:, 0]
+        memmap([1, 2])
+    """
+    count, length, _ = _read_header(path, CIRCUITS_MAGIC)
+    if count == 0:
+        return np.zeros((0, length), dtype="<i8")
+    return np.memmap(path, dtype="<i8", mode="r", offset=HEADER_SIZE, shape=(count, length))
@@ -0,0 +1,125 @@
+r"""
+Sign vectors as pairs of bitmasks.
+
+A sign vector is determined by its positive and its negative support.
+We encode each support as an integer with bit :math:`e` set
+if and only if :math:`e` is in the support.
+Operations on supports are then bitwise operations on integers::
+
+    sage: from sign_vectors import *
+    sage: from applications.bitsets import *
+    sage: X = sign_vector("+-0+")
+    sage: sign_vector_masks(X)
+    (9, 2)
+    sage: sign_vector_from_masks(9, 2, 4)
+    (+-0+)
+    sage: bit_indices(9)
+    [0, 3]
+    sage: mask_from_indices([0, 3])
+    9
+"""
+
+#############################################################################
+#  Copyright (C) 2025                                                       #
+#          Marcus S. Aichmayr (aichmayr@mathematik.uni-kassel.de)           #
+#                                                                           #
+#  Distributed under the terms of the GNU General Public License (GPL)      #
+#  either version 3, or (at your option) any later version                  #
+#                                                                           #
+#  http://www.gnu.org/licenses/                                             #
+#############################################################################
+
+from typing import Iterable
+
+from sage.misc.lazy_import import lazy_import
+
+lazy_import("sign_vectors", "sign_vector")
+
+
+def mask_from_indices(indices: Iterable[int]) -> int:
+    r"""
+    Return the bitmask with the given bits set.
+
+    EXAMPLES::
+
+        sage: from applications.bitsets import mask_from_indices
+        sage: mask_from_indices([])
+        0
+        sage: mask_from_indices([1, 2, 5])
+        38
+    """
+    mask = 0
+    for e in indices:
+        mask |= 1 << int(e)
+    return mask
+
+
+def bit_indices(mask: int) -> list[int]:
+    r"""
+    Return the positions of the set bits of a bitmask in increasing order.
+
+    EXAMPLES::
+
+        sage: from applications.bitsets import bit_indices
+        sage: bit_indices(0)
+        []
+        sage: bit_indices(38)
+        [1, 2, 5]
+    """
+    indices = []
+    while mask:
+        low = mask & -mask
+        indices.append(low.bit_length() - 1)
+        mask ^= low
+    return indices
+
+
+def sign_vector_masks(X) -> tuple[int, int]:
+    r"""
+    Return the positive and the negative support of a sign vector as bitmasks.
+
+    EXAMPLES::
+
+        sage: from sign_vectors import sign_vector
+        sage: from applications.bitsets import sign_vector_masks
+        sage: sign_vector_masks(sign_vector("0-++-"))
+        (12, 18)
+    """
+    return mask_from_indices(X.positive_support()), mask_from_indices(X.negative_support())
+
+
+def vector_masks(v) -> tuple[int, int]:
+    r"""
+    Return the positive and the negative support of a vector as bitmasks.
+
+    Symbolic signs are determined under the current assumptions.
+
+    EXAMPLES::
+
+        sage: from applications.bitsets import vector_masks
+        sage: vector_masks(vector([1, -2, 0, 3]))
+        (9, 2)
+        sage: var("a")
+        a
+        sage: assume(a > 0)
+        sage: vector_masks(vector([a, -a, 0]))
+        (1, 2)
+        sage: forget()
+    """
+    return sign_vector_masks(sign_vector(v))
+
+
+def sign_vector_from_masks(positive: int, negative: int, length: int):
+    r"""
+    Return the sign vector with given positive and negative support.
+
+    EXAMPLES::
+
+        sage: from applications.bitsets import sign_vector_from_masks
+        sage: sign_vector_from_masks(12, 18, 5)
+        (0-++-)
+    """
+    return sign_vector([
+        1 if positive >> e & 1 else (-1 if negative >> e & 1 else 0)
+        for e in range(length)
+    ])
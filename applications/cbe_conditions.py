@@ -0,0 +1,289 @@
+r"""
+Simplification of conditions on kinetic orders.
+
+==========================
+Simplifying CBE conditions
+==========================
+
+Methods like ``has_robust_cbe`` of reaction networks with symbolic kinetic orders
+return a list of sets of inequalities.
+The network satisfies the property if all inequalities of one of these sets hold.
+These lists may contain inequalities that are implied by others
+and sets that are implied by other sets.
+Also, the order of the output is not deterministic.
+
+We simplify such a list::
+
+    sage: from applications.cbe_conditions import simplify_conditions
+    sage: var("a, b, c")
+    (a, b, c)
+    sage: conditions = [
+    ....:     {a > 0, b > 0, a - c > 0},
+    ....:     {2 * b > 0, c < a, 0 < a, a + b > 0},
+    ....:     {a > 0, a < 0, b > 0},
+    ....:     {a > 0, b > 0, a - c > 0, c^2 > 0},
+    ....: ]
+    sage: simplify_conditions(conditions)
+    [[a - c > 0, a > 0, b > 0]]
+
+Here, the second set is the first set with the implied inequality :math:`a + b > 0`,
+the third set cannot be satisfied,
+and the fourth set is stronger than the first one.
+
+Each set is simplified as follows:
+
+- Each inequality is brought into the form :math:`p > 0`, :math:`p \geq 0`, :math:`p = 0` or :math:`p \neq 0`,
+  where :math:`p` is a polynomial with coprime integer coefficients.
+- Linear inequalities implied by the other linear inequalities of the set are removed.
+  Implication is decided by solvability of linear inequality systems,
+  checked with exact linear programs over the rationals in the current process.
+- Sets with unsatisfiable linear inequalities are removed.
+
+Simplified sets are cached.
+"""
+
+#############################################################################
+#  Copyright (C) 2025                                                       #
+#          Marcus S. Aichmayr (aichmayr@mathematik.uni-kassel.de)           #
+#                                                                           #
+#  Distributed under the terms of the GNU General Public License (GPL)      #
+#  either version 3, or (at your option) any later version                  #
+#                                                                           #
+#  http://www.gnu.org/licenses/                                             #
+#############################################################################
+
+import operator
+from functools import lru_cache
+
+_OPERATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+_COMPARISONS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+# relation ``p op 0`` as ``(kind, sign)`` with ``kind`` applied to ``sign * p``
+_KINDS = {
+    operator.gt: (">", 1),
+    operator.ge: (">=", 1),
+    operator.lt: (">", -1),
+    operator.le: (">=", -1),
+    operator.eq: ("==", 1),
+    operator.ne: ("!=", 1),
+}
+
+
+def _ring(relations) -> object:
+    from sage.rings.polynomial.polynomial_ring_constructor import PolynomialRing
+    from sage.rings.rational_field import QQ
+
+    names = sorted({str(x) for relation in relations for x in relation.variables()})
+    return PolynomialRing(QQ, names, len(names)) if names else QQ
+
+
+def _canonical(relation, ring) -> tuple:
+    r"""
+    Return ``(kind, key)`` representing ``key kind 0``.
+
+    The key is a polynomial in ``ring`` if possible and a string otherwise.
+    """
+    from sage.arith.misc import gcd, lcm
+    from sage.rings.rational_field import QQ
+
+    try:
+        kind, sign = _KINDS[relation.operator()]
+    except KeyError:
+        raise ValueError(f"{relation} is not a relation") from None
+    expression = sign * (relation.lhs() - relation.rhs())
+    try:
+        p = ring(expression)
+    except (TypeError, ValueError):
+        return kind, str(expression.expand())
+    if p == 0:
+        return kind, p
+
+    coefficients = [p] if ring is QQ else p.coefficients()
+    scale = lcm([c.denominator() for c in coefficients]) / gcd([c.numerator() for c in coefficients])
+    if kind in ["==", "!="] and (p if ring is QQ else p.lc()) < 0:
+        scale = -scale
+    return kind, scale * p
+
+
+def _relation(kind: str, key):
+    from sage.symbolic.ring import SR
+
+    return _OPERATORS[kind](SR(key), 0)
+
+
+def canonical_relation(relation):
+    r"""
+    Return a relation in canonical form.
+
+    OUTPUT:
+    A relation :math:`p > 0`, :math:`p \geq 0`, :math:`p = 0` or :math:`p \neq 0`
+    equivalent to ``relation``.
+    If possible, :math:`p` is a polynomial with coprime integer coefficients.
+    For equations, the leading coefficient of :math:`p` is positive.
+
+    EXAMPLES::
+
+        sage: from applications.cbe_conditions import canonical_relation
+        sage: var("a, b, c")
+        (a, b, c)
+        sage: canonical_relation(2 * a - 4 < 2 * c)
+        -a + c + 2 > 0
+        sage: canonical_relation(a * b <= 3)
+        -a*b + 3 >= 0
+        sage: canonical_relation(a / 2 == b / 3)
+        3*a - 2*b == 0
+        sage: canonical_relation(-a == b)
+        a + b == 0
+        sage: canonical_relation(sqrt(a) > 1)
+        sqrt(a) - 1 > 0
+    """
+    return _relation(*_canonical(relation, _ring([relation])))
+
+
+def _is_linear(key) -> bool:
+    from sage.rings.rational_field import QQ
+
+    return not isinstance(key, str) and (key in QQ or key.degree() <= 1)
+
+
+def _is_solvable(ring, constraints: list[tuple]) -> bool:
+    r"""
+    Return whether linear constraints ``(kind, p)`` with ``kind`` in ``>``, ``>=``, ``==``, ``<``, ``<=`` have a solution.
+
+    Strict inequalities :math:`p > 0` are replaced by :math:`p \geq t`.
+    The system has a solution if and only if the maximum of :math:`t \leq 1` is positive.
+    """
+    from sage.numerical.mip import MixedIntegerLinearProgram, MIPSolverException
+    from sage.rings.rational_field import QQ
+
+    program = MixedIntegerLinearProgram(maximization=True, base_ring=QQ)
+    x = program.new_variable(real=True, nonnegative=False)
+    t = x["slack"]
+    strict = False
+    for kind, p in constraints:
+        if p in QQ:
+            if not _COMPARISONS[kind](QQ(p), 0):
+                return False
+            continue
+        expression = sum(p.monomial_coefficient(y) * x[i] for i, y in enumerate(ring.gens())) + p.constant_coefficient()
+        if kind in ["<", "<="]:
+            expression = -expression
+        if kind == "==":
+            program.add_constraint(expression == 0)
+        elif kind in [">", "<"]:
+            program.add_constraint(expression >= t)
+            strict = True
+        else:
+            program.add_constraint(expression >= 0)
+    program.add_constraint(t <= 1)
+    program.set_objective(t)
+    try:
+        optimum = program.solve()
+    except MIPSolverException:
+        return False
+    return not strict or optimum > 0
+
+
+_NEGATIONS = {
+    ">": ["<="],
+    ">=": ["<"],
+    "==": ["<", ">"],
+}
+
+
+def _is_implied(ring, constraints: list[tuple], constraint: tuple) -> bool:
+    kind, p = constraint
+    return not any(
+        _is_solvable(ring, constraints + [(negation, p)])
+        for negation in _NEGATIONS[kind]
+    )
+
+
+@lru_cache(maxsize=4096)
+def _simplify_set(ring, relations: frozenset) -> frozenset:
+    r"""
+    Return a simplified set of canonical relations or ``None`` if the set is unsatisfiable.
+    """
+    linear = sorted(
+        (relation for relation in relations if relation[0] != "!=" and _is_linear(relation[1])),
+        key=str,
+    )
+    others = relations.difference(linear)
+
+    if not _is_solvable(ring, linear):
+        return None
+    kept = list(linear)
+    for relation in linear:
+        remaining = [other for other in kept if other != relation]
+        if _is_implied(ring, remaining, relation):
+            kept = remaining
+    return frozenset(kept).union(others)
+
+
+def simplify_conditions(conditions):
+    r"""
+    Simplify a list of sets of relations.
+
+    INPUT:
+
+    - ``conditions`` -- a list of sets of relations, interpreted as disjunction of conjunctions,
+      or a boolean
+
+    OUTPUT:
+    An equivalent list of lists of canonical relations.
+    Relations within each list and the lists themselves are sorted.
+    A boolean input is returned unchanged.
+
+    .. SEEALSO::
+
+        :func:`canonical_relation`
+
+    EXAMPLES::
+
+        sage: from applications.cbe_conditions import simplify_conditions
+        sage: var("a, b, c")
+        (a, b, c)
+        sage: simplify_conditions([{a > 1, a > 0}])
+        [[a - 1 > 0]]
+        sage: simplify_conditions([{a >= 0}, {a >= 0, b >= 0}, {b >= 1}])
+        [[a >= 0], [b - 1 >= 0]]
+        sage: simplify_conditions([{a == b, a - b >= 0, b > 0}])
+        [[a - b == 0, b > 0]]
+        sage: simplify_conditions([{a > 0, a < 0}])
+        []
+        sage: simplify_conditions([{a*b > 0, 2*a*b > 0}])
+        [[a*b > 0]]
+        sage: simplify_conditions(True)
+        True
+    """
+    if conditions in [True, False]:
+        return conditions
+    conditions = [set(relations) for relations in conditions]
+    ring = _ring(relation for relations in conditions for relation in relations)
+
+    simplified = set()
+    for relations in conditions:
+        result = _simplify_set(ring, frozenset(_canonical(relation, ring) for relation in relations))
+        if result is not None:
+            simplified.add(result)
+    # a set containing another set is implied by it
+    minimal = [
+        relations for relations in simplified
+        if not any(other < relations for other in simplified)
+    ]
+    return sorted(
+        (sorted((_relation(*relation) for relation in relations), key=str) for relations in minimal),
+        key=str,
+    )
@@ -0,0 +1,365 @@
+r"""
+Sampling-based prescreen of conditions for complex-balanced equilibria.
+
+===========================
+Prescreen of CBE conditions
+===========================
+
+For reaction networks with symbolic kinetic orders,
+methods like ``has_robust_cbe`` derive semialgebraic conditions on the parameters.
+For many parameters, this symbolic step becomes expensive.
+Instead, we can first evaluate the condition for many specific parameter values.
+Since the kinetic orders are then rational numbers, each evaluation is cheap.
+The result shows where the condition holds
+and gives points where it fails.
+
+We consider the network of [AMR24]_::
+
+    sage: from sign_crn import *
+    sage: from applications.cbe_prescreen import prescreen_cbe
+    sage: var("a, b, c")
+    (a, b, c)
+    sage: species("A, B, C, D, E")
+    (A, B, C, D, E)
+    sage: rn = ReactionNetwork()
+    sage: rn.add_complexes([(0, A + B, a * A + b * B), (1, C), (2, D, c * A + D), (3, A), (4, E)])
+    sage: rn.add_reactions([(0, 1), (1, 0), (1, 2), (2, 0), (3, 4), (4, 3)])
+
+We evaluate robustness of CBE on a grid with three values per parameter::
+
+    sage: result = prescreen_cbe(rn, "has_robust_cbe", ranges={a: (-1, 2), b: (-1, 2), c: (-1, 2)}, grid=3)
+    sage: result
+    has_robust_cbe holds at 6 of 27 points
+    sage: result.candidate_region()
+    {a: (1/2, 2), b: (1/2, 2), c: (-1, 1/2)}
+    sage: result.counterexamples()[:2]
+    [{a: -1, b: -1, c: -1}, {a: -1, b: -1, c: 1/2}]
+
+This agrees with the symbolic condition :math:`a, b > 0` and :math:`a > c`.
+We can also draw random points and evaluate them in parallel::
+
+    sage: result = prescreen_cbe(rn, "has_at_most_one_cbe", ranges={a: (0, 1), b: (0, 1), c: (-1, 0)}, samples=20, jobs=2)
+    sage: result.holds_everywhere()
+    True
+"""
+
+#############################################################################
+#  Copyright (C) 2025                                                       #
+#          Marcus S. Aichmayr (aichmayr@mathematik.uni-kassel.de)           #
+#                                                                           #
+#  Distributed under the terms of the GNU General Public License (GPL)      #
+#  either version 3, or (at your option) any later version                  #
+#                                                                           #
+#  http://www.gnu.org/licenses/                                             #
+#############################################################################
+
+import random
+from itertools import product
+
+from sage.misc.lazy_import import lazy_import
+
+from applications.worker_pool import process_pool
+
+lazy_import("sage.rings.rational_field", "QQ")
+
+CONDITIONS = ["has_at_most_one_cbe", "has_robust_cbe", "has_exactly_one_cbe"]
+
+# conditions requiring a weakly reversible network with deficiency zero
+_DEFICIENCY_ZERO_CONDITIONS = ["has_robust_cbe", "has_exactly_one_cbe"]
+
+_network = None
+
+
+def _set_network(rn) -> None:
+    global _network
+    _network = rn
+
+
+def _evaluate(rn, condition: str, parameters: list, point: tuple) -> bool:
+    r"""
+    Return the condition at a point or ``None`` if the instantiated network does not satisfy its assumptions.
+    """
+    instance = rn(**{str(p): value for p, value in zip(parameters, point)})
+    if condition in _DEFICIENCY_ZERO_CONDITIONS and not (
+        instance.deficiency_stoichiometric == instance.deficiency_kinetic_order == 0
+        and instance.is_weakly_reversible()
+    ):
+        return None
+    return bool(getattr(instance, condition)())
+
+
+def _evaluate_chunk(condition: str, parameters: list, points: list[tuple]) -> list[bool]:
+    return [_evaluate(_network, condition, parameters, point) for point in points]
+
+
+def grid_points(ranges: list[tuple], steps: int) -> list[tuple]:
+    r"""
+    Return the points of a regular grid with rational coordinates.
+
+    INPUT:
+
+    - ``ranges`` -- a list of pairs ``(lower, upper)``
+
+    - ``steps`` -- the number of values per coordinate
+
+    EXAMPLES::
+
+        sage: from applications.cbe_prescreen import grid_points
+        sage: grid_points([(0, 1), (-1, 1)], 3)
+        [(0, -1), (0, 0), (0, 1), (1/2, -1), (1/2, 0), (1/2, 1), (1, -1), (1, 0), (1, 1)]
+        sage: grid_points([(0, 1)], 1)
+        [(1/2,)]
+    """
+    if steps == 1:
+        values = [[(QQ(lower) + QQ(upper)) / 2] for lower, upper in ranges]
+    else:
+        values = [
+            [QQ(lower) + i * (QQ(upper) - QQ(lower)) / (steps - 1) for i in range(steps)]
+            for lower, upper in ranges
+        ]
+    return list(product(*values))
+
+
+def random_points(ranges: list[tuple], samples: int, seed: int = 0, denominator: int = 1000) -> list[tuple]:
+    r"""
+    Return random points with rational coordinates.
+
+    INPUT:
+
+    - ``ranges`` -- a list of pairs ``(lower, upper)``
+
+    - ``samples`` -- the number of points
+
+    - ``seed`` -- a seed for the random number generator (default: ``0``)
+
+    - ``denominator`` -- each coordinate is of the form
+      ``lower + k * (upper - lower) / denominator`` (default: ``1000``)
+
+    EXAMPLES::
+
+        sage: from applications.cbe_prescreen import random_points
+        sage: points = random_points([(0, 1), (-1, 1)], 5, seed=1)
+        sage: len(points)
+        5
+        sage: all(0 <= x <= 1 and -1 <= y <= 1 for x, y in points)
+        True
+        sage: points == random_points([(0, 1), (-1, 1)], 5, seed=1)
+        True
+    """
+    generator = random.Random(seed)
+    return [
+        tuple(
+            QQ(lower) + generator.randint(0, denominator) * (QQ(upper) - QQ(lower)) / denominator
+            for lower, upper in ranges
+        )
+        for _ in range(samples)
+    ]
+
+
+class PrescreenResult:
+    r"""
+    Evaluations of a condition at sample points of the parameter space.
+
+    INPUT:
+
+    - ``condition`` -- the name of the evaluated method
+
+    - ``parameters`` -- a list of symbolic parameters
+
+    - ``points`` -- a list of tuples of parameter values
+
+    - ``values`` -- a list of booleans, the condition at each point;
+      ``None`` marks a degenerate point where the condition cannot be evaluated
+
+    EXAMPLES::
+
+        sage: from applications.cbe_prescreen import PrescreenResult
+        sage: var("a, b")
+        (a, b)
+        sage: result = PrescreenResult("has_robust_cbe", [a, b], [(0, 1), (1, 1), (2, 3)], [False, True, True])
+        sage: result
+        has_robust_cbe holds at 2 of 3 points
+        sage: result.satisfying_points()
+        [{a: 1, b: 1}, {a: 2, b: 3}]
+        sage: result.counterexamples()
+        [{a: 0, b: 1}]
+        sage: result.candidate_region()
+        {a: (1, 2), b: (1, 3)}
+        sage: result.holds_everywhere(), result.fails_everywhere()
+        (False, False)
+        sage: PrescreenResult("has_robust_cbe", [a], [(0,)], [False]).candidate_region() is None
+        True
+
+    Degenerate points are neither satisfying points nor counterexamples::
+
+        sage: result = PrescreenResult("has_robust_cbe", [a, b], [(0, 1), (1, 1), (2, 3)], [None, True, True])
+        sage: result
+        has_robust_cbe holds at 2 of 3 points (1 degenerate)
+        sage: result.degenerate_points()
+        [{a: 0, b: 1}]
+        sage: result.counterexamples()
+        []
+        sage: result.holds_everywhere(), result.fails_everywhere()
+        (False, False)
+    """
+
+    def __init__(self, condition: str, parameters: list, points: list[tuple], values: list[bool]) -> None:
+        self.condition = condition
+        self.parameters = list(parameters)
+        self.points = list(points)
+        self.values = list(values)
+
+    def __repr__(self) -> str:
+        result = f"{self.condition} holds at {self.values.count(True)} of {len(self.points)} points"
+        degenerate = self.values.count(None)
+        if degenerate:
+            result += f" ({degenerate} degenerate)"
+        return result
+
+    def _as_dict(self, point: tuple) -> dict:
+        return dict(zip(self.parameters, point))
+
+    def satisfying_points(self) -> list[dict]:
+        r"""
+        Return the points where the condition holds.
+        """
+        return [self._as_dict(point) for point, value in zip(self.points, self.values) if value]
+
+    def counterexamples(self) -> list[dict]:
+        r"""
+        Return the points where the condition fails.
+        """
+        return [self._as_dict(point) for point, value in zip(self.points, self.values) if value is False]
+
+    def degenerate_points(self) -> list[dict]:
+        r"""
+        Return the points where the condition cannot be evaluated.
+
+        For instance, ``has_robust_cbe`` requires a weakly reversible network with deficiency zero
+        which may not hold for specific parameter values.
+        """
+        return [self._as_dict(point) for point, value in zip(self.points, self.values) if value is None]
+
+    def candidate_region(self) -> dict:
+        r"""
+        Return the bounding box of the points where the condition holds.
+
+        OUTPUT:
+        A dictionary mapping each parameter to a pair ``(lower, upper)``
+        or ``None`` if the condition holds at no point.
+        """
+        satisfying = [point for point, value in zip(self.points, self.values) if value]
+        if not satisfying:
+            return None
+        return {
+            parameter: (min(coordinates), max(coordinates))
+            for parameter, coordinates in zip(self.parameters, zip(*satisfying))
+        }
+
+    def holds_everywhere(self) -> bool:
+        r"""
+        Return whether the condition holds at all sample points.
+
+        In this case, the symbolic condition most likely covers the sampled region.
+        """
+        return all(value is True for value in self.values)
+
+    def fails_everywhere(self) -> bool:
+        r"""
+        Return whether the condition fails at all sample points.
+
+        In this case, the symbolic derivation can most likely be skipped for the sampled region.
+        """
+        return True not in self.values
+
+
+def prescreen_cbe(
+    rn,
+    condition: str = "has_robust_cbe",
+    ranges: dict = None,
+    grid: int = None,
+    samples: int = 100,
+    seed: int = 0,
+    jobs: int = 1,
+) -> PrescreenResult:
+    r"""
+    Evaluate a CBE condition of a reaction network at sample points of its parameters.
+
+    INPUT:
+
+    - ``rn`` -- a reaction network with symbolic kinetic orders
+
+    - ``condition`` -- one of ``"has_at_most_one_cbe"``, ``"has_robust_cbe"`` and ``"has_exactly_one_cbe"``
+
+    - ``ranges`` -- a dictionary mapping parameters to pairs ``(lower, upper)``;
+      each missing parameter ranges from ``-3`` to ``3``
+
+    - ``grid`` -- if given, evaluate on a regular grid with this number of values per parameter
+
+    - ``samples`` -- otherwise, evaluate at this number of random points (default: ``100``)
+
+    - ``seed`` -- a seed for the random points (default: ``0``)
+
+    - ``jobs`` -- the number of processes (default: ``1``)
+
+    OUTPUT:
+    A :class:`PrescreenResult`.
+    Points where the instantiated network is not weakly reversible or has positive deficiency
+    are recorded as degenerate for ``has_robust_cbe`` and ``has_exactly_one_cbe``.
+    Other errors are raised.
+    The parameter values are rational, so each evaluation is exact.
+    Still, a finite sample cannot prove that a condition holds on a region.
+
+    EXAMPLES::
+
+        sage: from sign_crn import *
+        sage: from applications.cbe_prescreen import prescreen_cbe
+        sage: var("a")
+        a
+        sage: species("A, B")
+        (A, B)
+        sage: rn = ReactionNetwork()
+        sage: rn.add_complexes([(0, A, a * A), (1, B)])
+        sage: rn.add_reactions([(0, 1), (1, 0)])
+        sage: prescreen_cbe(rn, "has_at_most_one_cbe", ranges={a: (1, 3)}, grid=3)
+        has_at_most_one_cbe holds at 3 of 3 points
+
+    For ``a = 0``, the kinetic-order deficiency of the following network is positive::
+
+        sage: rn = ReactionNetwork()
+        sage: rn.add_complexes([(0, A, a * A + B), (1, B)])
+        sage: rn.add_reactions([(0, 1), (1, 0)])
+        sage: result = prescreen_cbe(rn, "has_robust_cbe", ranges={a: (-1, 1)}, grid=3)
+        sage: result.degenerate_points()
+        [{a: 0}]
+
+    TESTS::
+
+        sage: prescreen_cbe(rn, "has_cbe")
+        Traceback (most recent call last):
+        ...
+        ValueError: unknown condition 'has_cbe'
+    """
+    if condition not in CONDITIONS:
+        raise ValueError(f"unknown condition {condition!r}")
+    if ranges is None:
+        ranges = {}
+    parameters = list(rn.kinetic_order_matrix.variables())
+    bounds = [ranges.get(parameter, (-3, 3)) for parameter in parameters]
+    if grid is not None:
+        points = grid_points(bounds, grid)
+    else:
+        points = random_points(bounds, samples, seed=seed)
+
+    if jobs == 1:
+        values = [_evaluate(rn, condition, parameters, point) for point in points]
+    else:
+        size = max(1, len(points) // (4 * jobs))
+        chunks = [points[i:i + size] for i in range(0, len(points), size)]
+        with process_pool(jobs, initializer=_set_network, initargs=(rn,)) as executor:
+            values = [
+                value
+                for chunk_values in executor.map(_evaluate_chunk, [condition] * len(chunks), [parameters] * len(chunks), chunks)
+                for value in chunk_values
+            ]
+    return PrescreenResult(condition, parameters, points, values)
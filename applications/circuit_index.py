@@ -0,0 +1,332 @@
+r"""
+Canonical forms and an index for lists of circuits.
+
+=================
+Index of circuits
+=================
+
+Lists of circuits may contain vectors that differ only by a scalar factor.
+We bring each vector into a canonical form:
+
+- the entries are polynomials (or numbers) with coprime integer coefficients,
+- the leading coefficient of the first nonzero entry is positive.
+
+A :class:`CircuitIndex` removes duplicates and answers support queries
+without scanning the list::
+
+    sage: from applications.circuit_index import *
+    sage: var("mu")
+    mu
+    sage: evs = [
+    ....:     vector([0, -2, 2*mu, 0]),
+    ....:     vector([1, 0, 0, mu - 1]),
+    ....:     vector([0, 1, -mu, 0]),
+    ....:     vector([-2, 2, 0, 0]),
+    ....: ]
+    sage: index = CircuitIndex(evs)
+    sage: index
+    Index of 3 circuits of length 4
+    sage: list(index)
+    [(0, 1, -mu, 0), (1, 0, 0, mu - 1), (1, -1, 0, 0)]
+    sage: index.positions
+    [0, 1, 0, 2]
+
+We look for circuits with a given support or with support contained in a given set::
+
+    sage: index.with_support([1, 2])
+    [(0, 1, -mu, 0)]
+    sage: index.with_support_in([0, 1, 2])
+    [(0, 1, -mu, 0), (1, -1, 0, 0)]
+    sage: vector([0, 3, -3*mu, 0]) in index
+    True
+"""
+
+#############################################################################
+#  Copyright (C) 2025                                                       #
+#          Marcus S. Aichmayr (aichmayr@mathematik.uni-kassel.de)           #
+#                                                                           #
+#  Distributed under the terms of the GNU General Public License (GPL)      #
+#  either version 3, or (at your option) any later version                  #
+#                                                                           #
+#  http://www.gnu.org/licenses/                                             #
+#############################################################################
+
+from typing import Iterable
+
+from applications.bitsets import bit_indices, mask_from_indices
+
+
+def _polynomial_entries(v) -> tuple:
+    r"""
+    Return a ring over ``QQ`` and the entries of ``v`` as elements of this ring.
+    """
+    from sage.rings.integer_ring import ZZ
+    from sage.rings.polynomial.polynomial_ring_constructor import PolynomialRing
+    from sage.rings.rational_field import QQ
+    from sage.symbolic.ring import SR
+
+    R = v.base_ring()
+    if R is SR:
+        names = sorted({str(x) for entry in v for x in SR(entry).variables()})
+        ring = PolynomialRing(QQ, names) if names else QQ
+    elif R in [ZZ, QQ]:
+        ring = QQ
+    else:
+        try:
+            ring = R.change_ring(QQ)
+        except AttributeError:
+            raise TypeError(f"cannot normalize vectors over {R}") from None
+    try:
+        return ring, [ring(entry) for entry in v]
+    except (TypeError, ValueError):
+        raise TypeError(f"entries of {v} are not polynomials") from None
+
+
+def _canonical_entries(v, remove_common_factor: bool = False) -> tuple:
+    from sage.arith.misc import gcd, lcm
+    from sage.rings.rational_field import QQ
+
+    ring, entries = _polynomial_entries(v)
+    nonzero = [x for x in entries if x != 0]
+    if not nonzero:
+        return ring, entries
+    if remove_common_factor and ring is not QQ:
+        divisor = gcd(nonzero)
+        entries = [x // divisor for x in entries]
+        nonzero = [x for x in entries if x != 0]
+
+    coefficients = nonzero if ring is QQ else [c for x in nonzero for c in x.coefficients()]
+    scale = lcm([c.denominator() for c in coefficients]) / gcd([c.numerator() for c in coefficients])
+    leading = nonzero[0] if ring is QQ else nonzero[0].lc()
+    if leading < 0:
+        scale = -scale
+    return ring, [scale * x for x in entries]
+
+
+def canonical_form(v, remove_common_factor: bool = False):
+    r"""
+    Return the canonical form of a vector up to scaling.
+
+    INPUT:
+
+    - ``v`` -- a vector with rational, polynomial or symbolic polynomial entries
+
+    - ``remove_common_factor`` -- a boolean (default: ``False``);
+      if true, also divide by the greatest common divisor of the polynomial entries
+
+    OUTPUT:
+    A multiple of ``v`` whose entries have coprime integer coefficients
+    and whose first nonzero entry has a positive leading coefficient.
+
+    .. NOTE::
+
+        Dividing by a polynomial factor like :math:`\mu - 1` may change the signs of the entries.
+        Therefore, only constant factors are removed by default.
+
+    EXAMPLES::
+
+        sage: from applications.circuit_index import canonical_form
+        sage: canonical_form(vector([0, -2, 4, -6]))
+        (0, 1, -2, 3)
+        sage: canonical_form(vector(QQ, [1/2, -1/3]))
+        (3, -2)
+        sage: var("mu")
+        mu
+        sage: canonical_form(vector([0, -2*mu + 2, 4]))
+        (0, mu - 1, -2)
+        sage: canonical_form(vector([mu^2 - mu, mu - 1]))
+        (mu^2 - mu, mu - 1)
+        sage: canonical_form(vector([mu^2 - mu, mu - 1]), remove_common_factor=True)
+        (mu, 1)
+        sage: R.<x, y> = ZZ[]
+        sage: canonical_form(vector([-2*x, 4*x*y]))
+        (x, -2*x*y)
+
+    TESTS::
+
+        sage: canonical_form(vector([0, 0]))
+        (0, 0)
+        sage: canonical_form(vector([sqrt(mu), 1]))
+        Traceback (most recent call last):
+        ...
+        TypeError: entries of (sqrt(mu), 1) are not polynomials
+    """
+    _, entries = _canonical_entries(v, remove_common_factor=remove_common_factor)
+    return _vector(v.base_ring(), entries)
+
+
+def _vector(R, entries: list):
+    r"""
+    Return a vector over ``R`` with the given normalized entries.
+    """
+    from sage.modules.free_module_element import vector
+    from sage.symbolic.ring import SR
+
+    if R is SR:
+        return vector(SR, [SR(x) for x in entries])
+    return vector(R, entries)
+
+
+class CircuitIndex:
+    r"""
+    An index of circuits up to scaling.
+
+    INPUT:
+
+    - ``circuits`` -- an iterable of vectors of the same length
+
+    - ``remove_common_factor`` -- a boolean (default: ``False``),
+      see :func:`canonical_form`
+
+    The circuits are stored in canonical form without duplicates.
+    Building the index takes linear time in the number of circuits.
+    For each component, we store the set of circuits that vanish on it as a bitset.
+    Hence, support queries need a number of bitwise operations
+    that depends on the length of the circuits only.
+
+    EXAMPLES::
+
+        sage: from elementary_vectors import *
+        sage: from applications.circuit_index import CircuitIndex
+        sage: M = matrix([[1, 1, 2, 0], [0, 0, 1, 2]])
+        sage: evs = circuits(M)
+        sage: index = CircuitIndex(evs + [-v for v in evs])
+        sage: index
+        Index of 3 circuits of length 4
+        sage: index.positions
+        [0, 1, 2, 0, 1, 2]
+        sage: index[1]
+        (4, 0, -2, 1)
+        sage: index.support(1)
+        [0, 2, 3]
+        sage: index.with_support([0, 2, 3])
+        [(4, 0, -2, 1)]
+        sage: index.with_support([0, 1])
+        [(1, -1, 0, 0)]
+        sage: index.with_support([0])
+        []
+        sage: index.with_support_in(range(4))
+        [(1, -1, 0, 0), (4, 0, -2, 1), (0, 4, -2, 1)]
+        sage: index.with_support_in([1, 2, 3])
+        [(0, 4, -2, 1)]
+        sage: index.index(vector([-8, 0, 4, -2]))
+        1
+        sage: index.index(vector([1, 1, 1, 1]))
+        Traceback (most recent call last):
+        ...
+        ValueError: (1, 1, 1, 1) is not in the index
+
+    TESTS::
+
+        sage: CircuitIndex([])
+        Index of 0 circuits of length 0
+        sage: CircuitIndex([vector([1, 0]), vector([1, 0, 0])])
+        Traceback (most recent call last):
+        ...
+        ValueError: circuits have different lengths
+    """
+
+    def __init__(self, circuits: Iterable, remove_common_factor: bool = False) -> None:
+        self._remove_common_factor = remove_common_factor
+        self.length = None
+        self._circuits = []
+        self._keys = {}
+        self._supports = []
+        self._by_support = {}
+        self.positions = []
+
+        for v in circuits:
+            if self.length is None:
+                self.length = len(v)
+            elif len(v) != self.length:
+                raise ValueError("circuits have different lengths")
+            ring, entries = _canonical_entries(v, remove_common_factor=remove_common_factor)
+            key = tuple(entries)
+            position = self._keys.get(key)
+            if position is None:
+                position = len(self._circuits)
+                self._keys[key] = position
+                self._circuits.append(_vector(v.base_ring(), entries))
+                support = mask_from_indices(e for e, x in enumerate(entries) if x != 0)
+                self._supports.append(support)
+                self._by_support.setdefault(support, []).append(position)
+            self.positions.append(position)
+        if self.length is None:
+            self.length = 0
+
+        # ``_vanishing[e]`` has bit ``i`` set if circuit ``i`` is zero at component ``e``
+        self._vanishing = [0] * self.length
+        for position, support in enumerate(self._supports):
+            for e in range(self.length):
+                if not support >> e & 1:
+                    self._vanishing[e] |= 1 << position
+
+    def __repr__(self) -> str:
+        return f"Index of {len(self)} circuits of length {self.length}"
+
+    def __len__(self) -> int:
+        return len(self._circuits)
+
+    def __getitem__(self, position: int):
+        return self._circuits[position]
+
+    def __iter__(self):
+        return iter(self._circuits)
+
+    def __contains__(self, v) -> bool:
+        try:
+            self.index(v)
+        except (TypeError, ValueError):
+            return False
+        return True
+
+    def index(self, v) -> int:
+        r"""
+        Return the position of the canonical form of ``v`` in the index.
+        """
+        _, entries = _canonical_entries(v, remove_common_factor=self._remove_common_factor)
+        try:
+            return self._keys[tuple(entries)]
+        except KeyError:
+            raise ValueError(f"{v} is not in the index") from None
+
+    def support(self, position: int) -> list[int]:
+        r"""
+        Return the support of a circuit of the index.
+        """
+        return bit_indices(self._supports[position])
+
+    def support_mask(self, position: int) -> int:
+        r"""
+        Return the support of a circuit of the index as bitmask.
+        """
+        return self._supports[position]
+
+    def positions_with_support(self, support: Iterable[int]) -> list[int]:
+        r"""
+        Return the positions of the circuits with the given support.
+        """
+        return list(self._by_support.get(mask_from_indices(support), []))
+
+    def with_support(self, support: Iterable[int]) -> list:
+        r"""
+        Return the circuits with the given support.
+        """
+        return [self._circuits[position] for position in self.positions_with_support(support)]
+
+    def positions_with_support_in(self, support: Iterable[int]) -> list[int]:
+        r"""
+        Return the positions of the circuits whose support is contained in the given set.
+        """
+        mask = mask_from_indices(support)
+        selected = (1 << len(self)) - 1
+        for e in range(self.length):
+            if not mask >> e & 1:
+                selected &= self._vanishing[e]
+        return bit_indices(selected)
+
+    def with_support_in(self, support: Iterable[int]) -> list:
+        r"""
+        Return the circuits whose support is contained in the given set.
+        """
+        return [self._circuits[position] for position in self.positions_with_support_in(support)]
@@ -0,0 +1,416 @@
+r"""
+Command-line interface for batch analysis.
+
+======================
+Command-line interface
+======================
+
+The package can be run as a program to analyze many matrices or reaction networks::
+
+    $ sage -python -m applications --operations circuits,covector-count --jobs 4 matrices.jsonl
+
+Each line of the input is a JSON value describing a matrix or a reaction network.
+A matrix is given by a list of rows.
+Entries are numbers or strings of symbolic expressions::
+
+    [[1, 1, 2, 0], [0, 0, 1, 2]]
+    {"name": "ecxs", "matrix": [[1, 1, 0, "-mu"], [0, 1, 1, 1]]}
+
+A reaction network is given by its species, parameters, complexes and reactions::
+
+    {"name": "rn", "species": "A, B, C, D, E", "parameters": "a, b, c",
+     "complexes": [[0, "A + B", "a*A + b*B"], [1, "C"], [2, "D", "c*A + D"], [3, "A"], [4, "E"]],
+     "reactions": [[0, 1], [1, 0], [1, 2], [2, 0], [3, 4], [4, 3]]}
+
+(A network has to be written on a single line.)
+Empty lines and lines starting with ``#`` are ignored.
+Results are written as JSON lines as soon as they are computed::
+
+    sage: from applications.cli import main
+    sage: import os, tempfile
+    sage: path = os.path.join(tempfile.mkdtemp(), "matrices.jsonl")
+    sage: with open(path, "w") as file:
+    ....:     _ = file.write('[[1, 1, 2, 0], [0, 0, 1, 2]]\n')
+    ....:     _ = file.write('{"name": "P", "matrix": [[1, 2, 0, 0], [0, 1, 2, 3]]}\n')
+    sage: main(["--operations", "circuits,covector-count", path])
+    {"input": "1", "operation": "circuits", "result": "[(1, -1, 0, 0), (4, 0, -2, 1), (0, 4, -2, 1)]"}
+    {"input": "1", "operation": "covector-count", "result": "13"}
+    {"input": "P", "operation": "circuits", "result": "[(4, -2, 1, 0), (6, -3, 0, 1), (0, 0, -3, 2)]"}
+    {"input": "P", "operation": "covector-count", "result": "13"}
+
+With ``--jobs``, inputs are processed in parallel
+and the order of the output lines is not deterministic::
+
+    sage: main(["--operations", "nonnegative-circuits", "--jobs", "2", path]) # random
+    {"input": "P", "operation": "nonnegative-circuits", "result": "[]"}
+    {"input": "1", "operation": "nonnegative-circuits", "result": "[]"}
+
+Errors are reported per input and operation::
+
+    sage: with open(path, "w") as file:
+    ....:     _ = file.write('{"species": "A, B", "complexes": [[0, "A"], [1, "B"]], "reactions": [[0, 1], [1, 0]]}\n')
+    ....:     _ = file.write('[[1, 2], [3\n')
+    ....:     _ = file.write('[[1, "x +"]]\n')
+    ....:     _ = file.write('[[1, 2]]\n')
+    sage: main(["--operations", "circuits,at-most-one-cbe", path])
+    {"input": "1", "operation": "circuits", "error": "operation 'circuits' requires a matrix"}
+    {"input": "1", "operation": "at-most-one-cbe", "result": "True"}
+    {"input": "2", "error": "invalid JSON: ..."}
+    {"input": "3", "error": "..."}
+    {"input": "4", "operation": "circuits", "result": "[(2, -1)]"}
+    {"input": "4", "operation": "at-most-one-cbe", "error": "operation 'at-most-one-cbe' requires a reaction network"}
+"""
+
+#############################################################################
+#  Copyright (C) 2025                                                       #
+#          Marcus S. Aichmayr (aichmayr@mathematik.uni-kassel.de)           #
+#                                                                           #
+#  Distributed under the terms of the GNU General Public License (GPL)      #
+#  either version 3, or (at your option) any later version                  #
+#                                                                           #
+#  http://www.gnu.org/licenses/                                             #
+#############################################################################
+
+import argparse
+import json
+import sys
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Iterator
+
+from applications.worker_pool import process_pool, run_operation
+
+MATRIX_OPERATIONS = {
+    "circuits": lambda M: run_operation("circuits", M),
+    "nonnegative-circuits": lambda M: run_operation("non_negative_vectors", run_operation("circuits", M)),
+    "cocircuits": lambda M: run_operation("cocircuits", M),
+    "covector-count": lambda M: len(run_operation("covectors", M)),
+}
+
+NETWORK_OPERATIONS = {
+    "at-most-one-cbe": lambda rn: run_operation("has_at_most_one_cbe", rn),
+    "robust-cbe": lambda rn: run_operation("has_robust_cbe", rn),
+    "exactly-one-cbe": lambda rn: run_operation("has_exactly_one_cbe", rn),
+}
+
+
+def _parse_entry(entry):
+    from sage.symbolic.ring import SR
+
+    if isinstance(entry, str):
+        return SR(entry)
+    return entry
+
+
+def parse_matrix(rows: list):
+    r"""
+    Return a matrix given by a list of rows.
+
+    Strings are parsed as symbolic expressions.
+    Matrices without variables are defined over the integers or rationals.
+
+    EXAMPLES::
+
+        sage: from applications.cli import parse_matrix
+        sage: M = parse_matrix([[1, 1, 0, "-mu"], [0, 1, "1/2", 1]])
+        sage: M
+        [  1   1   0 -mu]
+        [  0   1 1/2   1]
+        sage: M.base_ring()
+        Symbolic Ring
+        sage: parse_matrix([[1, "1/2"]]).base_ring()
+        Rational Field
+        sage: parse_matrix([[1, 2]]).base_ring()
+        Integer Ring
+    """
+    from sage.matrix.constructor import matrix
+    from sage.rings.integer_ring import ZZ
+    from sage.rings.rational_field import QQ
+    from sage.symbolic.ring import SR
+
+    M = matrix([[_parse_entry(entry) for entry in row] for row in rows])
+    if M.base_ring() is SR and not M.variables():
+        for ring in [ZZ, QQ]:
+            try:
+                return M.change_ring(ring)
+            except (TypeError, ValueError):
+                pass
+    return M
+
+
+def _names(string: str) -> list[str]:
+    names = [name.strip() for name in string.split(",")]
+    for name in names:
+        if not name.isidentifier():
+            raise ValueError(f"invalid name {name!r}")
+    return names
+
+
+def _species(names: list[str]) -> tuple:
+    r"""
+    Return species with the given names.
+
+    The function ``species`` injects the names into the globals of its caller.
+    We call it in a private namespace to keep the globals of this module intact.
+    """
+    from sign_crn import species
+
+    namespace = {"species": species, "names": ", ".join(names)}
+    exec("elements = species(names)", namespace)
+    elements = namespace["elements"]
+    return elements if len(names) > 1 else (elements,)
+
+
+def _parse_complex(expression: str, species: dict, parameters: list[str]):
+    r"""
+    Return a linear combination of species given by a string.
+
+    The string is parsed as symbolic expression, not evaluated.
+    The coefficients are expressions in the parameters.
+    """
+    from sage.symbolic.ring import SR
+
+    try:
+        parsed = SR(expression)
+    except (TypeError, SyntaxError) as e:
+        raise ValueError(f"cannot parse complex {expression!r}") from e
+    unknown = {str(x) for x in parsed.variables()}.difference(species, parameters)
+    if unknown:
+        raise ValueError(f"unknown names {', '.join(sorted(unknown))} in complex {expression!r}")
+    variables = [SR.var(name) for name in species]
+    coefficients = [parsed.coefficient(x) for x in variables]
+    linear = (parsed - sum(c * x for c, x in zip(coefficients, variables))).expand().is_zero()
+    if not linear or any(str(x) in species for c in coefficients for x in c.variables()):
+        raise ValueError(f"complex {expression!r} is not a linear combination of species")
+    return sum(c * element for c, element in zip(coefficients, species.values()) if not c.is_zero())
+
+
+def parse_network(data: dict):
+    r"""
+    Return a reaction network given by a dictionary.
+
+    INPUT:
+
+    - ``data`` -- a dictionary with keys
+
+      - ``"species"`` -- a string of comma-separated species names
+      - ``"parameters"`` -- a string of comma-separated parameter names (optional)
+      - ``"complexes"`` -- a list of complexes ``[index, stoichiometric, kinetic_order]``,
+        where the kinetic-order complex is optional
+      - ``"reactions"`` -- a list of pairs of complex indices
+
+    EXAMPLES::
+
+        sage: from applications.cli import parse_network
+        sage: rn = parse_network({
+        ....:     "species": "A, B, C, D, E",
+        ....:     "parameters": "a, b, c",
+        ....:     "complexes": [[0, "A + B", "a*A + b*B"], [1, "C"], [2, "D", "c*A + D"], [3, "A"], [4, "E"]],
+        ....:     "reactions": [[0, 1], [1, 0], [1, 2], [2, 0], [3, 4], [4, 3]],
+        ....: })
+        sage: rn
+        Reaction network with 5 complexes, 6 reactions and 5 species.
+        sage: rn.complexes_kinetic_order
+        {0: a*A + b*B, 1: C, 2: c*A + D, 3: A, 4: E}
+
+    Complexes are parsed, not evaluated.
+    Species do not overwrite names of this module::
+
+        sage: import applications.cli
+        sage: rn = parse_network({"species": "json, main", "complexes": [[0, "json"], [1, "2*main"]], "reactions": [[0, 1]]})
+        sage: applications.cli.json.__name__
+        'json'
+        sage: parse_network({"species": "A", "complexes": [[0, "__import__('os')"]], "reactions": []})
+        Traceback (most recent call last):
+        ...
+        ValueError: ...
+        sage: parse_network({"species": "A, B", "complexes": [[0, "A*B"]], "reactions": []})
+        Traceback (most recent call last):
+        ...
+        ValueError: complex 'A*B' is not a linear combination of species
+    """
+    from sign_crn import ReactionNetwork
+
+    for key in ["species", "complexes", "reactions"]:
+        if key not in data:
+            raise ValueError(f"network record is missing {key!r}")
+    names = _names(data["species"])
+    species = dict(zip(names, _species(names)))
+    parameters = _names(data["parameters"]) if data.get("parameters") else []
+
+    rn = ReactionNetwork()
+    rn.add_complexes([
+        tuple([entry[0]] + [_parse_complex(expression, species, parameters) for expression in entry[1:]])
+        for entry in data["complexes"]
+    ])
+    rn.add_reactions([tuple(reaction) for reaction in data["reactions"]])
+    return rn
+
+
+def read_records(files: list[str]) -> Iterator[tuple[str, object]]:
+    r"""
+    Iterate over the JSON records of the given files.
+
+    INPUT:
+
+    - ``files`` -- a list of paths; ``"-"`` stands for the standard input
+
+    OUTPUT:
+    Pairs of a name and a decoded JSON value.
+    If a record has no name, its position in the input is used.
+    For a line that is not valid JSON, the value is a :class:`ValueError`.
+    """
+    position = 0
+    for path in files:
+        file = sys.stdin if path == "-" else open(path, encoding="utf-8")
+        try:
+            for line in file:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                position += 1
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield str(position), ValueError(f"invalid JSON: {e}")
+                    continue
+                if isinstance(record, dict) and "name" in record:
+                    yield str(record["name"]), record
+                else:
+                    yield str(position), record
+        finally:
+            if file is not sys.stdin:
+                file.close()
+
+
+def analyze(record, operations: list[str]) -> list[dict]:
+    r"""
+    Run operations on a matrix or reaction network given by a JSON record.
+
+    INPUT:
+
+    - ``record`` -- a list of rows or a dictionary, see :mod:`applications.cli`,
+      or an exception from :func:`read_records`
+
+    - ``operations`` -- a list of operation names of
+      :data:`MATRIX_OPERATIONS` or :data:`NETWORK_OPERATIONS`
+
+    OUTPUT:
+    A list of dictionaries with the key ``"operation"``
+    and either ``"result"`` or ``"error"``.
+    If the record cannot be parsed, a list with a single dictionary with the key ``"error"``.
+
+    EXAMPLES::
+
+        sage: from applications.cli import analyze
+        sage: analyze([[1, 2, 0, 0], [0, 1, 2, 3]], ["circuits", "cocircuits"])
+        [{'operation': 'circuits', 'result': '[(4, -2, 1, 0), (6, -3, 0, 1), (0, 0, -3, 2)]'},
+         {'operation': 'cocircuits', 'result': ...}]
+        sage: analyze([[1, 2]], ["robust-cbe"])
+        [{'operation': 'robust-cbe', 'error': "operation 'robust-cbe' requires a reaction network"}]
+        sage: analyze({"species": "A"}, ["robust-cbe"])
+        [{'error': "network record is missing 'complexes'"}]
+    """
+    try:
+        if isinstance(record, Exception):
+            raise record
+        if isinstance(record, dict) and "matrix" in record:
+            element, kind = parse_matrix(record["matrix"]), "matrix"
+        elif isinstance(record, dict):
+            element, kind = parse_network(record), "network"
+        else:
+            element, kind = parse_matrix(record), "matrix"
+    except Exception as e:
+        return [{"error": str(e)}]
+
+    results = []
+    for operation in operations:
+        try:
+            if operation in MATRIX_OPERATIONS:
+                if kind != "matrix":
+                    raise ValueError(f"operation {operation!r} requires a matrix")
+                result = MATRIX_OPERATIONS[operation](element)
+            elif operation in NETWORK_OPERATIONS:
+                if kind != "network":
+                    raise ValueError(f"operation {operation!r} requires a reaction network")
+                result = NETWORK_OPERATIONS[operation](element)
+            else:
+                raise ValueError(f"unknown operation {operation!r}")
+            results.append({"operation": operation, "result": str(result)})
+        except Exception as e:
+            results.append({"operation": operation, "error": str(e)})
+    return results
+
+
+def _results(future) -> list[dict]:
+    try:
+        return future.result()
+    except Exception as e:
+        return [{"error": str(e)}]
+
+
+def _write(name: str, results: list[dict], output) -> None:
+    for result in results:
+        output.write(json.dumps({"input": name, **result}) + "\n")
+    output.flush()
+
+
+def _positive_int(string: str) -> int:
+    value = int(string)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {string!r}")
+    return value
+
+
+def main(argv: list[str] = None) -> None:
+    r"""
+    Run the command-line interface.
+
+    INPUT:
+
+    - ``argv`` -- a list of arguments (default: ``sys.argv[1:]``)
+
+    TESTS::
+
+        sage: from applications.cli import main
+        sage: main(["--jobs", "0"])
+        Traceback (most recent call last):
+        ...
+        SystemExit: 2
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m applications",
+        description="Analyze matrices and reaction networks given as JSON lines.",
+    )
+    parser.add_argument("files", nargs="*", default=["-"], help="input files (default: standard input)")
+    parser.add_argument(
+        "--operations",
+        default="circuits",
+        help="comma-separated operations: " + ", ".join(list(MATRIX_OPERATIONS) + list(NETWORK_OPERATIONS)),
+    )
+    parser.add_argument("--jobs", type=_positive_int, default=1, help="number of parallel processes")
+    args = parser.parse_args(argv)
+
+    operations = [operation.strip() for operation in args.operations.split(",")]
+    for operation in operations:
+        if operation not in MATRIX_OPERATIONS and operation not in NETWORK_OPERATIONS:
+            parser.error(f"unknown operation {operation!r}")
+
+    records = read_records(args.files)
+    if args.jobs == 1:
+        for name, record in records:
+            _write(name, analyze(record, operations), sys.stdout)
+        return
+
+    # keep a bounded number of jobs in flight to stream large inputs
+    with process_pool(args.jobs) as executor:
+        pending = {}
+        for name, record in records:
+            pending[executor.submit(analyze, record, operations)] = name
+            if len(pending) >= 4 * args.jobs:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    _write(pending.pop(future), _results(future), sys.stdout)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                _write(pending.pop(future), _results(future), sys.stdout)
@@ -0,0 +1,426 @@
+r"""
+Timing of the examples in the application modules.
+
+==============
+Doctest timing
+==============
+
+The examples in the modules of ``applications`` are a collection of typical computations.
+This module runs each example statement individually,
+records its runtime and optionally its peak memory,
+and compares the results with previous runs.
+Statements that became slower than a threshold are reported as regressions.
+
+We create a module with examples::
+
+    sage: from applications.doctest_timing import *
+    sage: import os, tempfile
+    sage: directory = tempfile.mkdtemp()
+    sage: path = os.path.join(directory, "example.py")
+    sage: with open(path, "w") as file:
+    ....:     _ = file.write("'''\n    sage: n = 10\n    sage: factorial(n) # long time\n    3628800\n'''\n")
+    sage: extract_examples(path)
+    [Example(name='example', index=0, source='n = 10', line=2, long_time=False),
+     Example(name='example', index=1, source='factorial(n) # long time', line=3, long_time=True)]
+
+We time the examples twice, including the ones tagged with ``# long time``::
+
+    sage: results = time_examples(path, runs=2, long_time=True)
+    sage: [(result["key"], len(result["times"]), result["error"]) for result in results]
+    [('example:0', 2, None), ('example:1', 2, None)]
+
+The results are stored in a history file.
+Later runs are compared with the median of the previous runs::
+
+    sage: history_path = os.path.join(directory, "timings.json")
+    sage: history = load_history(history_path)
+    sage: find_regressions(history, results)
+    []
+    sage: update_history(history, results)
+    sage: save_history(history_path, history)
+    sage: slow = [dict(result, times=[10.0]) for result in results]
+    sage: [regression["key"] for regression in find_regressions(load_history(history_path), slow)]
+    ['example:0', 'example:1']
+
+The example modules :data:`EXAMPLE_MODULES` of the package can be timed from the command line::
+
+    $ sage -python -m applications.doctest_timing applications/ --runs 3 --history timings.json
+"""
+
+#############################################################################
+#  Copyright (C) 2025                                                       #
+#          Marcus S. Aichmayr (aichmayr@mathematik.uni-kassel.de)           #
+#                                                                           #
+#  Distributed under the terms of the GNU General Public License (GPL)      #
+#  either version 3, or (at your option) any later version                  #
+#                                                                           #
+#  http://www.gnu.org/licenses/                                             #
+#############################################################################
+
+import argparse
+import ast
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+import warnings
+from statistics import median
+from typing import NamedTuple
+
+
+class Example(NamedTuple):
+    r"""
+    A statement of an example in a docstring.
+
+    - ``name`` -- the module name followed by the qualified name of the documented object
+    - ``index`` -- the position of the statement in its docstring
+    - ``source`` -- the statement without prompts
+    - ``line`` -- the line of the statement in the file
+    - ``long_time`` -- whether the statement is tagged with ``# long time``
+    """
+    name: str
+    index: int
+    source: str
+    line: int
+    long_time: bool
+
+
+def _docstrings(tree: ast.Module, module: str) -> list[tuple[str, ast.Constant]]:
+    docstrings = []
+
+    def visit(node, name: str) -> None:
+        body = getattr(node, "body", [])
+        if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant) and isinstance(body[0].value.value, str):
+            docstrings.append((name, body[0].value))
+        for child in body:
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                visit(child, f"{name}.{child.name}")
+
+    visit(tree, module)
+    return docstrings
+
+
+def extract_examples(path: str, module: str = None) -> list[Example]:
+    r"""
+    Return the statements of the examples in the docstrings of a file.
+
+    INPUT:
+
+    - ``path`` -- the path of a Python file
+
+    - ``module`` -- the name of the module (default: the file name without extension)
+
+    Statements tagged with ``# optional`` are skipped.
+
+    EXAMPLES::
+
+        sage: from applications.doctest_timing import extract_examples
+        sage: import applications.ecxs_symbolic
+        sage: examples = extract_examples(applications.ecxs_symbolic.__file__, "applications.ecxs_symbolic")
+        sage: examples[0]
+        Example(name='applications.ecxs_symbolic', index=0, source='from elementary_vectors import *', line=13, long_time=False)
+        sage: examples[3].source
+        'M = matrix([[0, -1, 0, 0, 0, 0, 1, 0, -1, 0, 0, 0],\n...'
+    """
+    if module is None:
+        module = os.path.splitext(os.path.basename(path))[0]
+    with open(path, encoding="utf-8") as file:
+        tree = ast.parse(file.read(), filename=path)
+
+    examples = []
+    for name, node in _docstrings(tree, module):
+        index = 0
+        lines = node.value.splitlines()
+        position = 0
+        while position < len(lines):
+            stripped = lines[position].strip()
+            if not stripped.startswith("sage:"):
+                position += 1
+                continue
+            line = node.lineno + position
+            parts = [stripped[len("sage:"):].strip()]
+            position += 1
+            while position < len(lines) and lines[position].strip().startswith("....:"):
+                parts.append(lines[position].strip()[len("....:"):][1:])
+                position += 1
+            source = "\n".join(parts)
+            if "# optional" in parts[0]:
+                continue
+            examples.append(Example(name, index, source, line, "# long time" in parts[0]))
+            index += 1
+    return examples
+
+
+EXAMPLE_MODULES = ["ICMS_2024", "MoRN_2025", "ecxs_symbolic", "runtime_circuits"]
+
+
+def _run_examples(examples: list[Example], memory: bool) -> list[tuple[float, int, str]]:
+    r"""
+    Run statements, sharing a namespace within each docstring.
+
+    As in a doctest, each docstring starts with a fresh namespace and random seed ``0``.
+    The namespace is registered as the user globals, so that ``timeit`` finds its names.
+    """
+    from sage.all import forget
+    from sage.misc.randstate import set_random_seed
+    from sage.repl import user_globals
+    from sage.repl.preparse import preparse
+
+    try:
+        previous_globals = user_globals.get_globals()
+    except RuntimeError:
+        previous_globals = None
+    results = []
+    namespace = None
+    current = None
+    for example in examples:
+        if example.name != current:
+            current = example.name
+            forget()
+            set_random_seed(0)
+            namespace = {}
+            exec("from sage.all import *", namespace)
+            user_globals.set_globals(namespace)
+        error = None
+        peak = None
+        if memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                exec(compile(preparse(example.source), f"<{example.name}:{example.index}>", "exec"), namespace)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        elapsed = time.perf_counter() - start
+        if memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        results.append((elapsed, peak, error))
+    forget()
+    if previous_globals is not None:
+        user_globals.set_globals(previous_globals)
+    return results
+
+
+def time_examples(path: str, module: str = None, runs: int = 1, long_time: bool = False, memory: bool = False) -> list[dict]:
+    r"""
+    Time each example statement of a file.
+
+    INPUT:
+
+    - ``path`` -- the path of a Python file
+
+    - ``module`` -- the name of the module (default: the file name without extension)
+
+    - ``runs`` -- how often to run all examples (default: ``1``)
+
+    - ``long_time`` -- a boolean (default: ``False``);
+      if true, also run the statements tagged with ``# long time``
+
+    - ``memory`` -- a boolean (default: ``False``);
+      if true, record the peak memory of each statement with :mod:`tracemalloc`
+      in an additional run that is not timed
+
+    OUTPUT:
+    A list of dictionaries with keys
+
+    - ``"key"`` -- a string ``name:index`` identifying the statement,
+    - ``"source"`` -- the statement,
+    - ``"times"`` -- the runtime in seconds for each run,
+    - ``"memory"`` -- the peak memory in bytes or ``None``,
+    - ``"error"`` -- the last exception raised by the statement or ``None``.
+
+    The statements of each docstring share a namespace,
+    so each run repeats the statements of a docstring in order.
+    Expected output is not checked.
+
+    TESTS:
+
+    Statements using ``timeit`` and random numbers work as in a doctest::
+
+        sage: from applications.doctest_timing import time_examples
+        sage: import os, tempfile
+        sage: path = os.path.join(tempfile.mkdtemp(), "example.py")
+        sage: with open(path, "w") as file:
+        ....:     _ = file.write("'''\n    sage: M = matrix([[1, 2], [3, 4]])\n    sage: timeit('M.rank()', number=1, repeat=1)\n    sage: n = randint(0, 10^6)\n'''\n")
+        sage: [result["error"] for result in time_examples(path, runs=2)]
+        [None, None, None]
+    """
+    examples = [example for example in extract_examples(path, module) if long_time or not example.long_time]
+    results = [
+        {
+            "key": f"{example.name}:{example.index}",
+            "source": example.source,
+            "times": [],
+            "memory": None,
+            "error": None,
+        }
+        for example in examples
+    ]
+    for _ in range(runs):
+        for result, (elapsed, _, error) in zip(results, _run_examples(examples, memory=False)):
+            result["times"].append(elapsed)
+            result["error"] = error
+    # tracing allocations slows down the statements, so memory is measured separately
+    if memory:
+        for result, (_, peak, _) in zip(results, _run_examples(examples, memory=True)):
+            result["memory"] = peak
+    return results
+
+
+def load_history(path: str) -> dict[str, list[dict]]:
+    r"""
+    Return the timing history stored in a JSON file.
+
+    A missing file gives an empty history.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_history(path: str, history: dict[str, list[dict]]) -> None:
+    r"""
+    Store a timing history in a JSON file.
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(history, file, indent=1, sort_keys=True)
+
+
+def update_history(history: dict[str, list[dict]], results: list[dict]) -> None:
+    r"""
+    Append the median runtime and the memory of each statement to a history.
+
+    Statements that raised an exception are not recorded.
+    """
+    timestamp = time.time()
+    for result in results:
+        if result["error"] is not None:
+            continue
+        history.setdefault(result["key"], []).append({
+            "source": result["source"],
+            "time": median(result["times"]),
+            "memory": result["memory"],
+            "timestamp": timestamp,
+        })
+
+
+def find_regressions(history: dict[str, list[dict]], results: list[dict], threshold: float = 1.5, minimum: float = 0.01) -> list[dict]:
+    r"""
+    Return the statements that are slower than in the history.
+
+    INPUT:
+
+    - ``history`` -- a timing history, see :func:`update_history`
+
+    - ``results`` -- the output of :func:`time_examples`
+
+    - ``threshold`` -- a statement regressed if its median runtime exceeds
+      ``threshold`` times the median of its previous runtimes (default: ``1.5``)
+
+    - ``minimum`` -- differences below this number of seconds are ignored (default: ``0.01``)
+
+    OUTPUT:
+    A list of dictionaries with keys ``"key"``, ``"source"``, ``"time"``, ``"baseline"`` and ``"ratio"``.
+    Statements whose source changed since the last run are skipped.
+
+    EXAMPLES::
+
+        sage: from applications.doctest_timing import find_regressions
+        sage: history = {"m:0": [{"source": "x = 1", "time": 0.1}, {"source": "x = 1", "time": 0.2}]}
+        sage: find_regressions(history, [{"key": "m:0", "source": "x = 1", "times": [0.5], "error": None}])
+        [{'key': 'm:0', 'source': 'x = 1', 'time': 0.5, 'baseline': 0.15..., 'ratio': 3.33...}]
+        sage: find_regressions(history, [{"key": "m:0", "source": "x = 1", "times": [0.16], "error": None}])
+        []
+        sage: find_regressions(history, [{"key": "m:0", "source": "x = 2", "times": [0.5], "error": None}])
+        []
+    """
+    regressions = []
+    for result in results:
+        previous = history.get(result["key"])
+        if not previous or result["error"] is not None or previous[-1]["source"] != result["source"]:
+            continue
+        baseline = median(entry["time"] for entry in previous)
+        current = median(result["times"])
+        if current > threshold * baseline and current - baseline > minimum:
+            regressions.append({
+                "key": result["key"],
+                "source": result["source"],
+                "time": current,
+                "baseline": baseline,
+                "ratio": current / baseline if baseline else float("inf"),
+            })
+    return regressions
+
+
+def _module_files(paths: list[str], all_modules: bool = False) -> list[tuple[str, str]]:
+    r"""
+    Return the files and module names to time.
+
+    For a directory, only the modules in :data:`EXAMPLE_MODULES` are timed unless ``all_modules`` is true.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            package = os.path.basename(os.path.normpath(path))
+            for file in sorted(os.listdir(path)):
+                if not file.endswith(".py") or file.startswith("__"):
+                    continue
+                if all_modules or file[:-3] in EXAMPLE_MODULES:
+                    files.append((os.path.join(path, file), f"{package}.{file[:-3]}"))
+        else:
+            files.append((path, None))
+    return files
+
+
+def main(argv: list[str] = None) -> int:
+    r"""
+    Run the command-line interface.
+
+    OUTPUT:
+    ``1`` if a statement regressed and ``0`` otherwise.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m applications.doctest_timing",
+        description="Time each example statement and report regressions.",
+    )
+    parser.add_argument("paths", nargs="+", help="Python files or directories")
+    parser.add_argument("--all", action="store_true", help="time all modules of directories, not only the example modules")
+    parser.add_argument("--runs", type=int, default=3, help="number of runs")
+    parser.add_argument("--long", action="store_true", help="include statements tagged with '# long time'")
+    parser.add_argument("--memory", action="store_true", help="record peak memory in an additional untimed run")
+    parser.add_argument("--history", default="timings.json", help="JSON file of previous timings")
+    parser.add_argument("--threshold", type=float, default=1.5, help="slowdown factor reported as regression")
+    parser.add_argument("--no-update", action="store_true", help="do not store the timings in the history")
+    args = parser.parse_args(argv)
+
+    history = load_history(args.history)
+    regressions = []
+    results = []
+    for path, module in _module_files(args.paths, all_modules=args.all):
+        module_results = time_examples(path, module, runs=args.runs, long_time=args.long, memory=args.memory)
+        regressions += find_regressions(history, module_results, threshold=args.threshold)
+        results += module_results
+        for result in module_results:
+            status = "" if result["error"] is None else f"  [{result['error']}]"
+            print(f"{median(result['times']):10.4f}s  {result['key']}{status}")
+
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression['key']}: {regression['time']:.4f}s "
+            f"(baseline {regression['baseline']:.4f}s, x{regression['ratio']:.2f})\n"
+            f"    {regression['source'].splitlines()[0]}"
+        )
+    if not args.no_update:
+        update_history(history, results)
+        save_history(args.history, history)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
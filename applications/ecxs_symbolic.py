@@ -107,6 +107,16 @@ Case :math:`\mu = 1`
      (1, 0, 1, 1, 0, 0, 0, 0, 0, 1, 0, 0),
      (0, 1, 0, 1, 1, 0, 1, 1, 0, 0, 1, 0),
      (1, 0, 1, 1, 0, 1, 0, 1, 0, 0, 0, 1)]
+
+Several cases at once
+=====================
+
+The cases :math:`0 < \mu < 1` and :math:`1 < \mu < 2` can also be evaluated in parallel::
+
+    sage: from applications.ecxs_symbolic import non_negative_vectors_by_assumptions
+    sage: results = non_negative_vectors_by_assumptions(elements, [[mu > 0, mu < 1], [mu > 1, mu < 2]], jobs=2)
+    sage: [len(result) for result in results]
+    [4, 4]
 """
 
 #############################################################################
@@ -119,9 +129,14 @@ Case :math:`\mu = 1`
 #  http://www.gnu.org/licenses/                                             #
 #############################################################################
 
-from sage.modules.free_module_element import vector
+from sage.misc.lazy_import import lazy_import
+
+lazy_import("sage.modules.free_module_element", "vector")
+lazy_import("sage.symbolic.assumptions", ["assume", "assumptions", "forget"])
+lazy_import("sign_vectors", "sign_vector")
+lazy_import("applications.worker_pool", "process_pool")
 
-from sign_vectors import sign_vector
+_vectors = None
 
 
 def non_negative_vectors(vectors: list[vector]) -> list[vector]:
@@ -137,6 +152,11 @@ def non_negative_vectors(vectors: list[vector]) -> list[vector]:
     Return all vectors that are nonnegative in each component.
     If a vector is nonpositive in each component, its negative is returned.
 
+    .. SEEALSO::
+
+        :class:`applications.sign_query.SignPatternQuery`
+        for several sign patterns on the same vectors
+
     EXAMPLES::
 
         sage: from applications.ecxs_symbolic import non_negative_vectors
@@ -164,10 +184,114 @@ def non_negative_vectors(vectors: list[vector]) -> list[vector]:
         sage: non_negative_vectors(l)
         [(x, 0, 0)]
     """
+    vectors = list(vectors)
+    return [-vectors[index] if negate else vectors[index] for index, negate in _non_negative_positions(vectors)]
+
+
+def _non_negative_positions(vectors: list[vector]) -> list[tuple[int, bool]]:
+    r"""
+    Return the indices of the nonnegative and nonpositive vectors
+    together with whether the vector is nonpositive.
+    """
     result = []
-    for element in vectors:
-        if sign_vector(element) >= 0:
-            result.append(element)
-        elif sign_vector(element) < 0:
-            result.append(-element)
+    for index, element in enumerate(vectors):
+        X = sign_vector(element)
+        if X >= 0:
+            result.append((index, False))
+        elif X < 0:
+            result.append((index, True))
     return result
+
+
+def _set_vectors(vectors: list[vector]) -> None:
+    global _vectors
+    _vectors = vectors
+
+
+def _assume_context(context: list) -> None:
+    r"""
+    Replace the assumptions by a context, skipping redundant assumptions.
+    """
+    forget()
+    for assumption in context:
+        try:
+            assume(assumption)
+        except ValueError as e:
+            if "redundant" not in str(e):
+                raise
+
+
+def _non_negative_positions_under(context: list) -> list[tuple[int, bool]]:
+    _assume_context(context)
+    return _non_negative_positions(_vectors)
+
+
+def non_negative_vectors_by_assumptions(vectors: list[vector], contexts: list[list], jobs: int = 1) -> list[list[vector]]:
+    r"""
+    Return nonnegative vectors under several sets of assumptions.
+
+    INPUT:
+
+    - ``vectors`` -- an iterable of vectors
+
+    - ``contexts`` -- a list of lists of assumptions,
+      for instance ``[[mu > 0, mu < 1], [mu > 1, mu < 2]]``;
+      redundant assumptions in a context are ignored
+
+    - ``jobs`` -- the number of processes (default: ``1``)
+
+    OUTPUT:
+    A list containing the result of :func:`non_negative_vectors` for each context.
+
+    Assumptions in Sage are global to a process.
+    Hence, for ``jobs > 1``, each context is evaluated in a forked worker process
+    that replaces the inherited assumptions by the context.
+    The workers only return the positions of the resulting vectors and whether they are negated.
+    For ``jobs=1``, the contexts are evaluated one after another.
+    In both cases, the assumptions of the calling process are the same afterwards.
+
+    EXAMPLES::
+
+        sage: from applications.ecxs_symbolic import non_negative_vectors_by_assumptions
+        sage: var("a")
+        a
+        sage: evs = [vector([0, 0, 1, 0, 0]), vector([-1, -a, 0, 0, a]), vector([a, 1, 0, 0, 0])]
+        sage: contexts = [[a > 0], [a < 0]]
+        sage: non_negative_vectors_by_assumptions(evs, contexts)
+        [[(0, 0, 1, 0, 0), (a, 1, 0, 0, 0)], [(0, 0, 1, 0, 0)]]
+        sage: non_negative_vectors_by_assumptions(evs, contexts, jobs=2)
+        [[(0, 0, 1, 0, 0), (a, 1, 0, 0, 0)], [(0, 0, 1, 0, 0)]]
+
+    A context may contain redundant assumptions::
+
+        sage: non_negative_vectors_by_assumptions(evs, [[a > 1, a > 0]])
+        [[(0, 0, 1, 0, 0), (a, 1, 0, 0, 0)]]
+        sage: non_negative_vectors_by_assumptions(evs, [[a > 1, a > 0], [a < 0]], jobs=2)
+        [[(0, 0, 1, 0, 0), (a, 1, 0, 0, 0)], [(0, 0, 1, 0, 0)]]
+
+    The assumptions of the calling process are kept::
+
+        sage: assume(a > 1)
+        sage: _ = non_negative_vectors_by_assumptions(evs, [[a < 0]])
+        sage: assumptions()
+        [a > 1]
+        sage: forget()
+    """
+    vectors = list(vectors)
+    if jobs == 1:
+        saved = assumptions()
+        results = []
+        try:
+            for context in contexts:
+                _assume_context(context)
+                results.append(_non_negative_positions(vectors))
+        finally:
+            forget()
+            assume(*saved)
+    else:
+        with process_pool(jobs, initializer=_set_vectors, initargs=(vectors,)) as executor:
+            results = list(executor.map(_non_negative_positions_under, contexts))
+    return [
+        [-vectors[index] if negate else vectors[index] for index, negate in positions]
+        for positions in results
+    ]
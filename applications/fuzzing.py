@@ -0,0 +1,302 @@
+r"""
+Differential fuzzing of circuit computations.
+
+====================
+Differential fuzzing
+====================
+
+Several functions compute the same information in different ways.
+For instance, the supports of ``circuits(M)`` should be the supports of ``circuit_supports(M)``
+and of the circuits of ``OrientedMatroid(M)``.
+We compare such functions on random matrices over
+the integers, the rationals, a polynomial ring and the algebraic numbers.
+Each random matrix is determined by a seed, so every case can be reproduced.
+
+We run a few cases::
+
+    sage: from applications.fuzzing import fuzz, random_test_matrix
+    sage: report = fuzz(cases=8, seed=0)
+    sage: report
+    Fuzzing report with 8 cases and 0 failures
+    sage: report.failures
+    []
+
+The runtime of each function is recorded::
+
+    sage: sorted(report.times)
+    ['OrientedMatroid.circuits', 'SignPatternQuery.non_negative', 'brute force', 'circuit_supports', 'circuits', 'non_negative_vectors']
+    sage: report.summary() # random
+    {'OrientedMatroid.circuits': {'min': 0.0008, 'median': 0.0011, 'max': 0.0043},
+     ...}
+
+Cases whose runtime exceeds the median runtime of the function by a given factor
+are considered pathologically slow.
+These cases can be saved as benchmarks::
+
+    sage: import os, tempfile
+    sage: directory = tempfile.mkdtemp()
+    sage: report = fuzz(cases=4, seed=0, slow_factor=0, minimum=0, directory=directory)
+    sage: len(report.slow_cases) > 0
+    True
+    sage: case = report.slow_cases[0]
+    sage: sorted(case)
+    ['columns', 'function', 'median', 'path', 'ring', 'rows', 'seed', 'time']
+    sage: load(case["path"]) == random_test_matrix(case["ring"], case["rows"], case["columns"], case["seed"])
+    True
+"""
+
+#############################################################################
+#  Copyright (C) 2025                                                       #
+#          Marcus S. Aichmayr (aichmayr@mathematik.uni-kassel.de)           #
+#                                                                           #
+#  Distributed under the terms of the GNU General Public License (GPL)      #
+#  either version 3, or (at your option) any later version                  #
+#                                                                           #
+#  http://www.gnu.org/licenses/                                             #
+#############################################################################
+
+import json
+import os
+import time
+from statistics import median
+
+from sage.misc.lazy_import import lazy_import
+
+from applications.ecxs_symbolic import non_negative_vectors
+from applications.sign_query import SignPatternQuery
+
+lazy_import("sage.misc.persist", "save")
+lazy_import("sage.misc.prandom", "randint")
+lazy_import("sage.misc.randstate", "seed", "random_seed")
+lazy_import("elementary_vectors", ["circuit_supports", "circuits"])
+lazy_import("sign_vectors", ["OrientedMatroid", "sign_vector"])
+
+RINGS = ("ZZ", "QQ", "polynomial", "QQbar")
+
+# rings where sign vectors of the random matrices are defined
+_ORDERED_RINGS = ("ZZ", "QQ", "QQbar")
+
+
+def random_test_matrix(ring: str, rows: int, columns: int, seed: int):
+    r"""
+    Return a random matrix with small entries.
+
+    INPUT:
+
+    - ``ring`` -- one of ``"ZZ"``, ``"QQ"``, ``"polynomial"`` and ``"QQbar"``
+
+    - ``rows``, ``columns`` -- the dimensions
+
+    - ``seed`` -- a seed for the random number generator
+
+    Small entries give many zero minors and hence many degenerate cases.
+    Matrices over ``QQbar`` have real entries :math:`a + \sqrt{b}`.
+    The global random state of Sage is not changed.
+
+    EXAMPLES::
+
+        sage: from applications.fuzzing import random_test_matrix
+        sage: M = random_test_matrix("ZZ", 2, 4, seed=1)
+        sage: M.dimensions()
+        (2, 4)
+        sage: M == random_test_matrix("ZZ", 2, 4, seed=1)
+        True
+        sage: set_random_seed(5)
+        sage: r = randint(0, 10^6)
+        sage: set_random_seed(5)
+        sage: _ = random_test_matrix("ZZ", 2, 4, seed=1)
+        sage: randint(0, 10^6) == r
+        True
+        sage: random_test_matrix("polynomial", 2, 3, seed=1).base_ring()
+        Multivariate Polynomial Ring in x, y over Integer Ring
+        sage: random_test_matrix("QQbar", 1, 2, seed=1).base_ring()
+        Algebraic Field
+        sage: random_test_matrix("RR", 1, 2, seed=1)
+        Traceback (most recent call last):
+        ...
+        ValueError: unknown ring 'RR'
+    """
+    from sage.matrix.constructor import matrix
+    from sage.rings.integer_ring import ZZ
+    from sage.rings.polynomial.polynomial_ring_constructor import PolynomialRing
+    from sage.rings.qqbar import QQbar
+    from sage.rings.rational_field import QQ
+
+    with random_seed(seed):
+        if ring == "ZZ":
+            entries = [ZZ(randint(-2, 2)) for _ in range(rows * columns)]
+            return matrix(ZZ, rows, columns, entries)
+        if ring == "QQ":
+            entries = [QQ(randint(-3, 3)) / randint(1, 3) for _ in range(rows * columns)]
+            return matrix(QQ, rows, columns, entries)
+        if ring == "polynomial":
+            R = PolynomialRing(ZZ, "x, y")
+            x, y = R.gens()
+            entries = [randint(-2, 2) + randint(-1, 1) * x + randint(-1, 1) * y for _ in range(rows * columns)]
+            return matrix(R, rows, columns, entries)
+        if ring == "QQbar":
+            entries = [QQbar(randint(-2, 2)) + QQbar(randint(0, 3)).sqrt() * randint(-1, 1) for _ in range(rows * columns)]
+            return matrix(QQbar, rows, columns, entries)
+    raise ValueError(f"unknown ring {ring!r}")
+
+
+def _brute_force_non_negative(vectors: list) -> list:
+    result = []
+    for v in vectors:
+        if all(x >= 0 for x in v):
+            result.append(v)
+        elif all(x <= 0 for x in v):
+            result.append(-v)
+    return result
+
+
+class FuzzReport:
+    r"""
+    Results of :func:`fuzz`.
+
+    Attributes:
+
+    - ``cases`` -- the number of cases
+    - ``failures`` -- a list of dictionaries describing disagreements and exceptions
+    - ``times`` -- a dictionary mapping each function to its list of runtimes in seconds
+    - ``slow_cases`` -- a list of dictionaries describing pathologically slow cases
+    """
+
+    def __init__(self) -> None:
+        self.cases = 0
+        self.failures = []
+        self.times = {}
+        self.slow_cases = []
+        self._case_times = []
+
+    def __repr__(self) -> str:
+        return f"Fuzzing report with {self.cases} cases and {len(self.failures)} failures"
+
+    def _timed(self, case: dict, function: str, compute, *args):
+        start = time.perf_counter()
+        result = compute(*args)
+        elapsed = time.perf_counter() - start
+        self.times.setdefault(function, []).append(elapsed)
+        self._case_times.append((case, function, elapsed))
+        return result
+
+    def _fail(self, case: dict, check: str, details: str) -> None:
+        self.failures.append(dict(case, check=check, details=details))
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        r"""
+        Return the minimal, median and maximal runtime of each function.
+        """
+        return {
+            function: {"min": min(times), "median": median(times), "max": max(times)}
+            for function, times in sorted(self.times.items())
+        }
+
+
+def _check_case(report: FuzzReport, case: dict) -> None:
+    M = random_test_matrix(case["ring"], case["rows"], case["columns"], case["seed"])
+    evs = report._timed(case, "circuits", circuits, M)
+    supports = {frozenset(v.support()) for v in evs}
+    reference = {frozenset(s) for s in report._timed(case, "circuit_supports", circuit_supports, M)}
+    if supports != reference:
+        report._fail(case, "circuit supports", f"{sorted(map(sorted, supports))} != {sorted(map(sorted, reference))}")
+
+    if case["ring"] not in _ORDERED_RINGS:
+        return
+    om_circuits = report._timed(case, "OrientedMatroid.circuits", lambda M: OrientedMatroid(M).circuits(), M)
+    expected = {sign_vector(v) for v in evs} | {-sign_vector(v) for v in evs}
+    if set(om_circuits) != expected:
+        report._fail(case, "oriented matroid circuits", f"{sorted(map(str, om_circuits))} != {sorted(map(str, expected))}")
+
+    brute_force = report._timed(case, "brute force", _brute_force_non_negative, evs)
+    for function, compute in [
+        ("non_negative_vectors", non_negative_vectors),
+        ("SignPatternQuery.non_negative", lambda evs: SignPatternQuery(evs).non_negative()),
+    ]:
+        result = report._timed(case, function, compute, evs)
+        if result != brute_force:
+            report._fail(case, function, f"{result} != {brute_force}")
+
+
+def fuzz(
+    cases: int = 100,
+    rings: tuple[str, ...] = RINGS,
+    seed: int = 0,
+    max_rows: int = 4,
+    max_columns: int = 8,
+    slow_factor: float = 10,
+    minimum: float = 0.1,
+    directory: str = None,
+) -> FuzzReport:
+    r"""
+    Compare circuit computations on random matrices.
+
+    INPUT:
+
+    - ``cases`` -- the number of random matrices (default: ``100``)
+
+    - ``rings`` -- the rings to use in turn (default: :data:`RINGS`)
+
+    - ``seed`` -- case ``i`` uses the seed ``seed + i`` (default: ``0``)
+
+    - ``max_rows``, ``max_columns`` -- bounds for the dimensions (default: ``4`` and ``8``)
+
+    - ``slow_factor`` -- a case is slow for a function if its runtime exceeds
+      ``slow_factor`` times the median runtime of this function (default: ``10``)
+
+    - ``minimum`` -- runtimes below this number of seconds are never slow (default: ``0.1``)
+
+    - ``directory`` -- if given, slow cases are saved in this directory
+      as Sage object and JSON description
+
+    OUTPUT:
+    A :class:`FuzzReport`.
+
+    For each matrix, we check
+
+    - the supports of ``circuits(M)`` against ``circuit_supports(M)``,
+
+    and over ``ZZ``, ``QQ`` and ``QQbar`` additionally
+
+    - the sign vectors of ``circuits(M)`` against ``OrientedMatroid(M).circuits()``,
+    - :func:`~applications.ecxs_symbolic.non_negative_vectors` and
+      :meth:`~applications.sign_query.SignPatternQuery.non_negative`
+      against a brute-force filter.
+
+    Exceptions are reported as failures.
+
+    EXAMPLES::
+
+        sage: from applications.fuzzing import fuzz
+        sage: fuzz(cases=2, rings=["ZZ"], seed=5).cases
+        2
+    """
+    report = FuzzReport()
+    for i in range(cases):
+        with random_seed(seed + i):
+            rows = randint(1, max_rows)
+            columns = randint(rows, max(rows, max_columns))
+        case = {
+            "seed": seed + i,
+            "ring": rings[i % len(rings)],
+            "rows": rows,
+            "columns": columns,
+        }
+        report.cases += 1
+        try:
+            _check_case(report, case)
+        except Exception as e:
+            report._fail(case, "exception", f"{type(e).__name__}: {e}")
+
+    medians = {function: median(times) for function, times in report.times.items()}
+    for case, function, elapsed in report._case_times:
+        if elapsed >= minimum and elapsed > slow_factor * medians[function]:
+            slow = dict(case, function=function, time=elapsed, median=medians[function], path=None)
+            if directory is not None:
+                name = f"{case['ring']}_{case['rows']}x{case['columns']}_seed{case['seed']}_{function.replace(' ', '_')}"
+                slow["path"] = os.path.join(directory, name + ".sobj")
+                save(random_test_matrix(case["ring"], case["rows"], case["columns"], case["seed"]), slow["path"])
+                with open(os.path.join(directory, name + ".json"), "w", encoding="utf-8") as file:
+                    json.dump(slow, file, indent=2)
+            report.slow_cases.append(slow)
+    return report
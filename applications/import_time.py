@@ -0,0 +1,115 @@
+r"""
+Import-time benchmark.
+
+=====================
+Import-time benchmark
+=====================
+
+Short-lived worker processes pay the import cost of their modules before doing any work.
+The modules in ``applications`` defer heavy imports until first use.
+This module measures how long importing a module takes in a fresh interpreter::
+
+    sage: from applications.import_time import import_time, import_times
+    sage: import_time("applications") < import_time("sage.all") # long time
+    True
+
+We compare several modules at once::
+
+    sage: import_times(["applications", "applications.ecxs_symbolic", "sage.all"]) # long time, random
+    {'applications': 0.0004, 'applications.ecxs_symbolic': 0.08, 'sage.all': 1.3}
+"""
+
+#############################################################################
+#  Copyright (C) 2025                                                       #
+#          Marcus S. Aichmayr (aichmayr@mathematik.uni-kassel.de)           #
+#                                                                           #
+#  Distributed under the terms of the GNU General Public License (GPL)      #
+#  either version 3, or (at your option) any later version                  #
+#                                                                           #
+#  http://www.gnu.org/licenses/                                             #
+#############################################################################
+
+import subprocess
+import sys
+from statistics import median
+
+_SCRIPT = """
+import time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+
+def import_time(module: str, repeat: int = 5) -> float:
+    r"""
+    Return the time in seconds needed to import a module in a fresh interpreter.
+
+    INPUT:
+
+    - ``module`` -- the name of a module
+
+    - ``repeat`` -- the number of fresh interpreters to start (default: ``5``)
+
+    OUTPUT:
+    The median import time over all runs.
+    Interpreter startup is not included.
+
+    EXAMPLES::
+
+        sage: from applications.import_time import import_time
+        sage: import_time("applications", repeat=1) < 1 # long time
+        True
+
+    TESTS::
+
+        sage: import_time("applications.does_not_exist", repeat=1) # long time
+        Traceback (most recent call last):
+        ...
+        ImportError: importing 'applications.does_not_exist' failed:
+        ...
+        sage: import_time("applications", repeat=0)
+        Traceback (most recent call last):
+        ...
+        ValueError: ``repeat`` must be positive
+    """
+    if repeat < 1:
+        raise ValueError("``repeat`` must be positive")
+    times = []
+    for _ in range(repeat):
+        process = subprocess.run(
+            [sys.executable, "-c", _SCRIPT.format(module=module)],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if process.returncode != 0:
+            raise ImportError(f"importing {module!r} failed:\n{process.stderr}")
+        times.append(float(process.stdout))
+    return median(times)
+
+
+def import_times(modules: list[str], repeat: int = 5) -> dict[str, float]:
+    r"""
+    Return the import times of several modules.
+
+    INPUT:
+
+    - ``modules`` -- a list of module names
+
+    - ``repeat`` -- the number of fresh interpreters to start per module (default: ``5``)
+
+    OUTPUT:
+    A dictionary mapping each module to its median import time in seconds.
+
+    .. SEEALSO::
+
+        :func:`import_time`
+
+    EXAMPLES::
+
+        sage: from applications.import_time import import_times
+        sage: list(import_times(["applications"], repeat=1)) # long time
+        ['applications']
+    """
+    return {module: import_time(module, repeat=repeat) for module in modules}
@@ -0,0 +1,174 @@
+r"""
+Batched computation of maximal minors.
+
+==============
+Maximal minors
+==============
+
+Conditions on circuits and on reaction networks are often stated with the maximal minors of a matrix.
+The method ``M.minors(r)`` computes each determinant separately.
+For a matrix with parameters, each determinant is expanded in the symbolic ring.
+Instead, we convert the entries to a polynomial ring and compute all maximal minors together.
+The minors of the first :math:`k` rows are obtained by Laplace expansion along the :math:`k`-th row
+from the minors of the first :math:`k - 1` rows.
+Each of these smaller minors is computed once and shared by all column subsets containing its columns.
+Only additions and multiplications of polynomials occur, no divisions.
+
+The result agrees with ``M.minors(r)``::
+
+    sage: from applications.minors import maximal_minors
+    sage: M = matrix([[1, 1, 2, 0], [0, 0, 1, 2]])
+    sage: maximal_minors(M)
+    [0, 1, 2, 1, 2, 4]
+    sage: M.minors(2)
+    [0, 1, 2, 1, 2, 4]
+
+For symbolic matrices, the minors are polynomials.
+They can also be factored for a sign analysis::
+
+    sage: var("mu")
+    mu
+    sage: M = matrix([[1, 1, -mu, 0], [0, mu, 1, mu^2 + 1]])
+    sage: maximal_minors(M)
+    [mu, 1, mu^2 + 1, mu^2 + 1, mu^2 + 1, -mu^3 - mu]
+    sage: maximal_minors(M, factor=True)
+    [mu, 1, mu^2 + 1, mu^2 + 1, mu^2 + 1, (-1) * mu * (mu^2 + 1)]
+"""
+
+#############################################################################
+#  Copyright (C) 2025                                                       #
+#          Marcus S. Aichmayr (aichmayr@mathematik.uni-kassel.de)           #
+#                                                                           #
+#  Distributed under the terms of the GNU General Public License (GPL)      #
+#  either version 3, or (at your option) any later version                  #
+#                                                                           #
+#  http://www.gnu.org/licenses/                                             #
+#############################################################################
+
+from itertools import combinations
+
+
+def polynomial_matrix(M):
+    r"""
+    Return the matrix with symbolic entries converted to polynomials.
+
+    OUTPUT:
+    A matrix over a polynomial ring in the variables of ``M``
+    with integer coefficients if possible and rational coefficients otherwise.
+    Matrices that are not symbolic are returned unchanged.
+
+    EXAMPLES::
+
+        sage: from applications.minors import polynomial_matrix
+        sage: var("a, b")
+        (a, b)
+        sage: polynomial_matrix(matrix([[a, 1], [b, a * b]])).base_ring()
+        Multivariate Polynomial Ring in a, b over Integer Ring
+        sage: polynomial_matrix(matrix([[a / 2, 1]])).base_ring()
+        Univariate Polynomial Ring in a over Rational Field
+        sage: polynomial_matrix(matrix(SR, [[1, 2]])).base_ring()
+        Integer Ring
+        sage: polynomial_matrix(matrix([[sqrt(a), 1]]))
+        Traceback (most recent call last):
+        ...
+        TypeError: entries of the matrix are not polynomials
+    """
+    from sage.rings.integer_ring import ZZ
+    from sage.rings.polynomial.polynomial_ring_constructor import PolynomialRing
+    from sage.rings.rational_field import QQ
+    from sage.symbolic.ring import SR
+
+    if M.base_ring() is not SR:
+        return M
+    names = sorted(str(x) for x in M.variables())
+    for base in [ZZ, QQ]:
+        ring = PolynomialRing(base, names) if names else base
+        try:
+            return M.change_ring(ring)
+        except (TypeError, ValueError):
+            pass
+    raise TypeError("entries of the matrix are not polynomials")
+
+
+def maximal_minors(M, factor: bool = False) -> list:
+    r"""
+    Return the maximal minors of a matrix.
+
+    INPUT:
+
+    - ``M`` -- a matrix with :math:`r` rows
+
+    - ``factor`` -- a boolean (default: ``False``);
+      if true, nonzero minors are factored
+
+    OUTPUT:
+    The minors of the :math:`r \times r` submatrices
+    in the lexicographic order of the column subsets as for ``M.minors(r)``.
+    Symbolic entries are converted with :func:`polynomial_matrix`,
+    so the minors are elements of a polynomial ring.
+    If the entries are not polynomials, the minors are computed with ``M.minors(r)``.
+
+    The minors of the first :math:`k` rows are computed from those of the first :math:`k - 1` rows.
+    For :math:`n` columns, this takes
+    :math:`\sum_{k=1}^r k \binom{n}{k}` ring multiplications
+    instead of :math:`\binom{n}{r}` determinants.
+
+    EXAMPLES::
+
+        sage: from applications.minors import maximal_minors
+        sage: var("a, b, c")
+        (a, b, c)
+        sage: maximal_minors(matrix([[a, b, 1], [c, 1, a]]))
+        [-b*c + a, a^2 - c, a*b - 1]
+        sage: maximal_minors(matrix([[a, 0, 1], [0, a^2 + 1, 0]]), factor=True)
+        [a * (a^2 + 1), 0, (-1) * (a^2 + 1)]
+        sage: maximal_minors(matrix([[sqrt(a), 1]]))
+        [sqrt(a), 1]
+
+    TESTS::
+
+        sage: maximal_minors(matrix(ZZ, 0, 3))
+        [1]
+        sage: maximal_minors(matrix([[1], [2]]))
+        []
+        sage: M = random_matrix(ZZ, 3, 6)
+        sage: maximal_minors(M) == M.minors(3)
+        True
+    """
+    rows = M.nrows()
+    columns = M.ncols()
+    try:
+        A = polynomial_matrix(M)
+    except TypeError:
+        minors = M.minors(rows)
+    else:
+        minors = _maximal_minors(A, rows, columns)
+    if factor:
+        return [minor.factor() if minor else minor for minor in minors]
+    return minors
+
+
+def _maximal_minors(A, rows: int, columns: int) -> list:
+    ring = A.base_ring()
+    if rows > columns:
+        return []
+    previous = {(): ring.one()}
+    for k in range(rows):
+        row = A.row(k)
+        current = {}
+        for subset in combinations(range(columns), k + 1):
+            total = ring.zero()
+            for position, j in enumerate(subset):
+                entry = row[j]
+                if not entry:
+                    continue
+                minor = previous[subset[:position] + subset[position + 1:]]
+                if not minor:
+                    continue
+                if (k + position) % 2:
+                    total -= entry * minor
+                else:
+                    total += entry * minor
+            current[subset] = total
+        previous = current
+    return list(previous.values())
@@ -0,0 +1,305 @@
+r"""
+Profiling of stages in sign vector computations.
+
+=========
+Profiling
+=========
+
+When a computation like ``rn.has_exactly_one_cbe()`` or ``circuits(M)`` is slow,
+we want to know which functions of the packages
+`elementary_vectors <https://github.com/MarcusAichmayr/elementary_vectors>`_,
+`sign_vectors <https://github.com/MarcusAichmayr/sign_vectors>`_ and
+`sign_crn <https://github.com/MarcusAichmayr/sign_crn>`_ take the time.
+Within :func:`profile_stages`, each call of a Python function of these packages is a stage.
+For each stage, we record the number of calls, the time and optionally the peak memory::
+
+    sage: from elementary_vectors import *
+    sage: from sign_vectors import *
+    sage: from applications.profiling import profile_stages
+    sage: M = matrix([[1, 1, 2, 0], [0, 0, 1, 2]])
+    sage: with profile_stages(memory=True) as profiler:
+    ....:     _ = circuits(M)
+    ....:     _ = OrientedMatroid(M).covectors()
+    sage: any(stage.endswith("circuits") for stage in profiler.stats())
+    True
+    sage: print(profiler.report()) # random
+    stage                                                calls    time [s]    self [s]  memory [B]
+    elementary_vectors.elements.circuits                     1      0.0031      0.0012       24576
+    ...
+
+The stacks of stages can be written in the folded format of
+`FlameGraph <https://github.com/brendangregg/FlameGraph>`_
+and the statistics as JSON::
+
+    sage: import os, tempfile
+    sage: directory = tempfile.mkdtemp()
+    sage: profiler.write_folded(os.path.join(directory, "stages.folded"))
+    sage: profiler.write_json(os.path.join(directory, "stages.json"))
+"""
+
+#############################################################################
+#  Copyright (C) 2025                                                       #
+#          Marcus S. Aichmayr (aichmayr@mathematik.uni-kassel.de)           #
+#                                                                           #
+#  Distributed under the terms of the GNU General Public License (GPL)      #
+#  either version 3, or (at your option) any later version                  #
+#                                                                           #
+#  http://www.gnu.org/licenses/                                             #
+#############################################################################
+
+import dis
+import json
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+PACKAGES = ("elementary_vectors", "sign_vectors", "sign_crn")
+
+# code flags of generators and coroutines, whose frames are suspended and resumed
+_GENERATOR_FLAGS = 0x20 | 0x80 | 0x200
+_YIELD_OPCODES = {dis.opmap[name] for name in ["YIELD_VALUE", "YIELD_FROM"] if name in dis.opmap}
+
+
+def _is_suspended(frame) -> bool:
+    r"""
+    Return whether a frame returning to its caller is a generator frame that yields.
+    """
+    code = frame.f_code
+    return bool(code.co_flags & _GENERATOR_FLAGS) and code.co_code[frame.f_lasti] in _YIELD_OPCODES
+
+
+class _Frame:
+    __slots__ = ["frame", "stage", "start", "children", "base", "peak"]
+
+    def __init__(self, frame, stage: str, start: float, base: int) -> None:
+        self.frame = frame
+        self.stage = stage
+        self.start = start
+        self.children = 0.0
+        self.base = base
+        self.peak = base
+
+
+class StageProfiler:
+    r"""
+    Record calls, time and memory of functions of some packages.
+
+    INPUT:
+
+    - ``packages`` -- the names of the packages whose functions are stages
+      (default: :data:`PACKAGES`)
+
+    - ``memory`` -- a boolean (default: ``False``);
+      if true, record the peak memory allocated during each stage with :mod:`tracemalloc`
+
+    Use an instance as context manager or :func:`profile_stages`.
+    Only calls in the thread that entered the context are recorded.
+    Functions implemented in Cython are not recorded separately;
+    their time counts for the calling stage.
+
+    EXAMPLES::
+
+        sage: from applications.profiling import StageProfiler
+        sage: profiler = StageProfiler(packages=["applications"])
+        sage: from applications.bitsets import bit_indices, mask_from_indices
+        sage: with profiler:
+        ....:     _ = bit_indices(mask_from_indices([1, 4]))
+        ....:     _ = bit_indices(mask_from_indices([2]))
+        sage: profiler.stats()["applications.bitsets.mask_from_indices"]["calls"]
+        2
+        sage: sorted(profiler.folded())
+        ['applications.bitsets.bit_indices', 'applications.bitsets.mask_from_indices']
+
+    Recursive calls are counted separately, but their time is counted once for ``"time"``.
+
+    A generator is counted as one call, however often it is resumed.
+    Its time consists of the time it runs between resuming and yielding::
+
+        sage: from sign_vectors import sign_vector
+        sage: from applications.binary_format import save_sign_vectors, load_sign_vectors
+        sage: import os, tempfile
+        sage: path = os.path.join(tempfile.mkdtemp(), "sign_vectors.svec")
+        sage: save_sign_vectors(path, [sign_vector("+-0"), sign_vector("-00"), sign_vector("00+")])
+        3
+        sage: profiler = StageProfiler(packages=["applications"])
+        sage: with profiler:
+        ....:     _ = list(load_sign_vectors(path))
+        sage: [stats["calls"] for stage, stats in profiler.stats().items() if stage.endswith("__iter__")]
+        [1]
+        sage: [stats["calls"] for stage, stats in profiler.stats().items() if stage.endswith("__getitem__")]
+        [3]
+    """
+
+    def __init__(self, packages: tuple[str, ...] = PACKAGES, memory: bool = False) -> None:
+        self.packages = tuple(packages)
+        self.memory = memory
+        self._calls = Counter()
+        self._time = Counter()
+        self._self_time = Counter()
+        self._peak_memory = Counter()
+        self._folded = Counter()
+        self._stack = []
+        self._suspended = {}
+        self._active = Counter()
+        self._previous_profile = None
+        self._started_tracemalloc = False
+
+    def _stage(self, frame) -> str:
+        module = frame.f_globals.get("__name__", "")
+        code = frame.f_code
+        if code.co_name == "<module>" or frame.f_globals is globals() or module.split(".")[0] not in self.packages:
+            return None
+        return f"{module}.{getattr(code, 'co_qualname', code.co_name)}"
+
+    def _profile(self, frame, event: str, arg) -> None:
+        if event == "call":
+            entry = self._suspended.pop(frame, None)
+            if entry is None:
+                stage = self._stage(frame)
+                if stage is None:
+                    return
+                entry = _Frame(frame, stage, 0.0, 0)
+            if self.memory:
+                base, peak = tracemalloc.get_traced_memory()
+                if self._stack:
+                    self._stack[-1].peak = max(self._stack[-1].peak, peak)
+                tracemalloc.reset_peak()
+                entry.base = base
+                entry.peak = base
+            entry.start = time.perf_counter()
+            self._stack.append(entry)
+            self._active[entry.stage] += 1
+        elif event == "return" and self._stack and self._stack[-1].frame is frame:
+            if _is_suspended(frame):
+                self._suspended[frame] = self._leave(time.perf_counter())
+            else:
+                self._calls[self._leave(time.perf_counter()).stage] += 1
+
+    def _leave(self, now: float) -> _Frame:
+        r"""
+        Record the time since the frame on top of the stack was entered or resumed and remove it.
+        """
+        entry = self._stack.pop()
+        elapsed = now - entry.start
+        stage = entry.stage
+        self._active[stage] -= 1
+        if not self._active[stage]:
+            self._time[stage] += elapsed
+        self._self_time[stage] += elapsed - entry.children
+        path = ";".join([parent.stage for parent in self._stack] + [stage])
+        self._folded[path] += elapsed - entry.children
+        entry.children = 0.0
+        if self.memory:
+            peak = max(entry.peak, tracemalloc.get_traced_memory()[1])
+            self._peak_memory[stage] = max(self._peak_memory[stage], peak - entry.base)
+        if self._stack:
+            parent = self._stack[-1]
+            parent.children += elapsed
+            if self.memory:
+                parent.peak = max(parent.peak, peak)
+        return entry
+
+    def __enter__(self) -> "StageProfiler":
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._previous_profile = sys.getprofile()
+        sys.setprofile(self._profile)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        sys.setprofile(self._previous_profile)
+        now = time.perf_counter()
+        while self._stack:
+            self._calls[self._leave(now).stage] += 1
+        # generators that were not exhausted
+        for entry in self._suspended.values():
+            self._calls[entry.stage] += 1
+        self._suspended.clear()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def stats(self) -> dict[str, dict]:
+        r"""
+        Return the statistics of each stage.
+
+        OUTPUT:
+        A dictionary mapping each stage to a dictionary with keys
+
+        - ``"calls"`` -- the number of calls,
+        - ``"time"`` -- the total time in seconds including called stages,
+        - ``"self_time"`` -- the time in seconds excluding called stages,
+        - ``"memory"`` -- the peak memory in bytes allocated during a call
+          (``None`` if memory is not recorded).
+
+        The stages are sorted by decreasing time.
+        """
+        return {
+            stage: {
+                "calls": self._calls[stage],
+                "time": self._time[stage],
+                "self_time": self._self_time[stage],
+                "memory": self._peak_memory[stage] if self.memory else None,
+            }
+            for stage in sorted(self._calls, key=lambda stage: -self._time[stage])
+        }
+
+    def folded(self) -> dict[str, float]:
+        r"""
+        Return the self time in seconds of each stack of stages.
+
+        Stacks are strings of stages separated by ``;``.
+        """
+        return dict(self._folded)
+
+    def report(self) -> str:
+        r"""
+        Return a table of the statistics.
+        """
+        width = max([len("stage")] + [len(stage) for stage in self._calls])
+        lines = [f"{'stage':<{width}}  {'calls':>7}  {'time [s]':>10}  {'self [s]':>10}  {'memory [B]':>10}"]
+        for stage, stats in self.stats().items():
+            memory = "" if stats["memory"] is None else stats["memory"]
+            lines.append(
+                f"{stage:<{width}}  {stats['calls']:>7}  {stats['time']:>10.4f}  {stats['self_time']:>10.4f}  {memory:>10}"
+            )
+        return "\n".join(lines)
+
+    def write_json(self, path: str) -> None:
+        r"""
+        Write the statistics and the stacks of stages to a JSON file.
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"stages": self.stats(), "stacks": self.folded()}, file, indent=2)
+
+    def write_folded(self, path: str) -> None:
+        r"""
+        Write the stacks of stages in the folded format of FlameGraph.
+
+        Each line consists of a stack and its self time in microseconds.
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            for stack, seconds in sorted(self._folded.items()):
+                file.write(f"{stack} {round(seconds * 1e6)}\n")
+
+
+def profile_stages(packages: tuple[str, ...] = PACKAGES, memory: bool = False) -> StageProfiler:
+    r"""
+    Return a context manager recording the stages of a computation.
+
+    .. SEEALSO::
+
+        :class:`StageProfiler`
+
+    EXAMPLES::
+
+        sage: from sign_vectors import *
+        sage: from applications.profiling import profile_stages
+        sage: with profile_stages() as profiler:
+        ....:     _ = OrientedMatroid(matrix([[1, 2, 0], [0, 1, 2]])).cocircuits()
+        sage: all(stage.startswith("sign_vectors") for stage in profiler.stats())
+        True
+    """
+    return StageProfiler(packages=packages, memory=memory)
@@ -0,0 +1,295 @@
+r"""
+Sign pattern queries on circuits.
+
+====================
+Sign pattern queries
+====================
+
+Often, we filter the same list of circuits for several sign patterns,
+for instance, nonnegative circuits or circuits conformal to a given sign vector.
+A :class:`SignPatternQuery` determines the signs of all circuits once
+and stores them as bitsets.
+Each query is then answered by a few bitwise operations
+that process all circuits at once.
+
+We consider circuits with a parameter::
+
+    sage: from sign_vectors import *
+    sage: from applications.sign_query import SignPatternQuery
+    sage: var("a")
+    a
+    sage: evs = [vector([0, 0, 1, 0, 0]), vector([0, 0, 0, 1, 0]), vector([-1, -a, 0, 0, a])]
+    sage: query = SignPatternQuery(evs)
+    sage: query
+    Sign pattern query on 3 circuits of length 5
+
+Symbolic signs are determined under the current assumptions.
+The signs are computed once for each set of assumptions::
+
+    sage: assume(a > 0)
+    sage: query.non_negative()
+    [(0, 0, 1, 0, 0), (0, 0, 0, 1, 0)]
+    sage: query.select(negative=[0, 1])
+    [(-1, -a, 0, 0, a)]
+    sage: query.conformal(sign_vector("++00-"), up_to_sign=True)
+    [(1, a, 0, 0, -a)]
+    sage: forget()
+    sage: assume(a < 0)
+    sage: query.select(negative=[0, 1])
+    []
+    sage: query.select(negative=[0, 4])
+    [(-1, -a, 0, 0, a)]
+    sage: forget()
+"""
+
+#############################################################################
+#  Copyright (C) 2025                                                       #
+#          Marcus S. Aichmayr (aichmayr@mathematik.uni-kassel.de)           #
+#                                                                           #
+#  Distributed under the terms of the GNU General Public License (GPL)      #
+#  either version 3, or (at your option) any later version                  #
+#                                                                           #
+#  http://www.gnu.org/licenses/                                             #
+#############################################################################
+
+from typing import Iterable
+
+from sage.misc.lazy_import import lazy_import
+
+from applications.bitsets import bit_indices, vector_masks
+
+lazy_import("sage.symbolic.assumptions", "assumptions")
+
+
+class SignPatternQuery:
+    r"""
+    Filter a list of circuits by sign patterns.
+
+    INPUT:
+
+    - ``circuits`` -- a list of vectors of the same length,
+      for instance, the result of ``circuits(M)``
+
+    For each component :math:`e`, we store the sets of circuits
+    that are positive and negative at :math:`e` as bitsets.
+    The bitsets depend on the assumptions on symbolic variables.
+    They are computed on the first query in each context and cached.
+
+    EXAMPLES::
+
+        sage: from elementary_vectors import *
+        sage: from applications.sign_query import SignPatternQuery
+        sage: M = matrix([[1, 1, 2, 0], [0, 0, 1, 2]])
+        sage: query = SignPatternQuery(circuits(M))
+        sage: query.select(nonnegative=[0, 3])
+        [(1, -1, 0, 0), (4, 0, -2, 1), (0, 4, -2, 1)]
+        sage: query.select(positive=[0], zero=[1])
+        [(4, 0, -2, 1)]
+        sage: query.select(positive=[2], up_to_sign=True)
+        [(-4, 0, 2, -1), (0, -4, 2, -1)]
+        sage: query.select(nonzero=[0, 1])
+        [(1, -1, 0, 0)]
+        sage: query.count(zero=[2])
+        1
+        sage: query.non_negative()
+        []
+
+    TESTS::
+
+        sage: query.select(positive=[4])
+        Traceback (most recent call last):
+        ...
+        IndexError: component 4 out of range
+        sage: SignPatternQuery([]).non_negative()
+        []
+    """
+
+    def __init__(self, circuits: Iterable) -> None:
+        self.circuits = list(circuits)
+        self.length = len(self.circuits[0]) if self.circuits else 0
+        self._all = (1 << len(self.circuits)) - 1
+        self._signs = {}
+
+    def __repr__(self) -> str:
+        return f"Sign pattern query on {len(self.circuits)} circuits of length {self.length}"
+
+    def __len__(self) -> int:
+        return len(self.circuits)
+
+    @staticmethod
+    def _context() -> tuple[str, ...]:
+        return tuple(sorted(str(assumption) for assumption in assumptions()))
+
+    def _bitsets(self) -> tuple[list[int], list[int]]:
+        r"""
+        Return the bitsets of positive and negative circuits for each component.
+        """
+        context = self._context()
+        if context not in self._signs:
+            positive = [0] * self.length
+            negative = [0] * self.length
+            for position, v in enumerate(self.circuits):
+                v_positive, v_negative = vector_masks(v)
+                bit = 1 << position
+                for e in bit_indices(v_positive):
+                    positive[e] |= bit
+                for e in bit_indices(v_negative):
+                    negative[e] |= bit
+            self._signs[context] = positive, negative
+        return self._signs[context]
+
+    def _check(self, components: Iterable[int]) -> list[int]:
+        components = list(components)
+        for e in components:
+            if not 0 <= e < self.length:
+                raise IndexError(f"component {e} out of range")
+        return components
+
+    def _matching(
+        self,
+        positive: list[int],
+        negative: list[int],
+        pattern: dict[str, list[int]],
+    ) -> int:
+        selected = self._all
+        for e in pattern["positive"]:
+            selected &= positive[e]
+        for e in pattern["negative"]:
+            selected &= negative[e]
+        for e in pattern["zero"]:
+            selected &= ~(positive[e] | negative[e])
+        for e in pattern["nonnegative"]:
+            selected &= ~negative[e]
+        for e in pattern["nonpositive"]:
+            selected &= ~positive[e]
+        for e in pattern["nonzero"]:
+            selected &= positive[e] | negative[e]
+        return selected & self._all
+
+    def _select(self, up_to_sign: bool, **pattern) -> list[tuple[int, bool]]:
+        pattern = {key: self._check(components) for key, components in pattern.items()}
+        positive, negative = self._bitsets()
+        direct = self._matching(positive, negative, pattern)
+        if not up_to_sign:
+            return [(position, False) for position in bit_indices(direct)]
+        flipped = self._matching(negative, positive, pattern) & ~direct
+        return [(position, not direct >> position & 1) for position in bit_indices(direct | flipped)]
+
+    def select(
+        self,
+        positive: Iterable[int] = (),
+        negative: Iterable[int] = (),
+        zero: Iterable[int] = (),
+        nonnegative: Iterable[int] = (),
+        nonpositive: Iterable[int] = (),
+        nonzero: Iterable[int] = (),
+        up_to_sign: bool = False,
+    ) -> list:
+        r"""
+        Return the circuits with the given sign pattern.
+
+        INPUT:
+
+        - ``positive``, ``negative``, ``zero``, ``nonnegative``, ``nonpositive``, ``nonzero`` --
+          iterables of components with the corresponding sign condition
+
+        - ``up_to_sign`` -- a boolean (default: ``False``);
+          if true, also return the negatives of circuits whose negative has the sign pattern
+
+        OUTPUT:
+        A list of circuits in the original order.
+        """
+        return [
+            -self.circuits[position] if negated else self.circuits[position]
+            for position, negated in self._select(
+                up_to_sign,
+                positive=positive,
+                negative=negative,
+                zero=zero,
+                nonnegative=nonnegative,
+                nonpositive=nonpositive,
+                nonzero=nonzero,
+            )
+        ]
+
+    def count(
+        self,
+        positive: Iterable[int] = (),
+        negative: Iterable[int] = (),
+        zero: Iterable[int] = (),
+        nonnegative: Iterable[int] = (),
+        nonpositive: Iterable[int] = (),
+        nonzero: Iterable[int] = (),
+        up_to_sign: bool = False,
+    ) -> int:
+        r"""
+        Return the number of circuits with the given sign pattern.
+
+        The arguments are the same as for :meth:`select`.
+
+        EXAMPLES::
+
+            sage: from applications.sign_query import SignPatternQuery
+            sage: query = SignPatternQuery([vector([1, -1, 0]), vector([0, 1, 1]), vector([1, 0, -1])])
+            sage: query.count(nonnegative=[0])
+            3
+            sage: query.count(positive=[1])
+            1
+            sage: query.count(nonneg=[0])
+            Traceback (most recent call last):
+            ...
+            TypeError: ...count() got an unexpected keyword argument 'nonneg'
+        """
+        return len(self._select(
+            up_to_sign,
+            positive=positive,
+            negative=negative,
+            zero=zero,
+            nonnegative=nonnegative,
+            nonpositive=nonpositive,
+            nonzero=nonzero,
+        ))
+
+    def conformal(self, X, up_to_sign: bool = False) -> list:
+        r"""
+        Return the circuits that conform to a sign vector.
+
+        A vector :math:`v` conforms to :math:`X` if :math:`v_e = 0` or :math:`\operatorname{sign}(v_e) = X_e` for each :math:`e`.
+
+        EXAMPLES::
+
+            sage: from sign_vectors import sign_vector
+            sage: from applications.sign_query import SignPatternQuery
+            sage: query = SignPatternQuery([vector([1, -1, 0]), vector([0, 1, 1]), vector([1, 0, -1])])
+            sage: query.conformal(sign_vector("+-0"))
+            [(1, -1, 0)]
+            sage: query.conformal(sign_vector("+--"))
+            [(1, -1, 0), (1, 0, -1)]
+            sage: query.conformal(sign_vector("-+-"), up_to_sign=True)
+            [(-1, 1, 0)]
+        """
+        return self.select(
+            nonnegative=X.positive_support(),
+            nonpositive=X.negative_support(),
+            zero=X.zero_support(),
+            up_to_sign=up_to_sign,
+        )
+
+    def non_negative(self) -> list:
+        r"""
+        Return the nonnegative circuits.
+
+        Nonpositive circuits are returned as their negatives.
+
+        .. SEEALSO::
+
+            :func:`applications.ecxs_symbolic.non_negative_vectors`
+
+        EXAMPLES::
+
+            sage: from applications.sign_query import SignPatternQuery
+            sage: query = SignPatternQuery([vector([1, 1, 0, -1]), vector([0, 0, 0, 0]), vector([-1, 0, 0, -1])])
+            sage: query.non_negative()
+            [(0, 0, 0, 0), (1, 0, 0, 1)]
+        """
+        return self.select(nonnegative=range(self.length), up_to_sign=True)
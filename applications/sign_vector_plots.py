@@ -0,0 +1,380 @@
+r"""
+Aggregated plots of large sets of sign vectors.
+
+==========================
+Plotting many sign vectors
+==========================
+
+The function ``plot_sign_vectors`` draws each sign vector separately.
+For oriented matroids with thousands of covectors, such plots are slow and unreadable.
+Instead, we count the sign vectors by a summary statistic and draw the counts.
+The sign vectors are consumed one by one,
+so they can be generated lazily or loaded from a binary file.
+
+We consider the covectors of an oriented matroid::
+
+    sage: from sign_vectors import *
+    sage: from applications.sign_vector_plots import *
+    sage: M = matrix([[1, 2, 0], [0, 1, 2]])
+    sage: om = OrientedMatroid(M)
+    sage: len(om.covectors())
+    13
+
+We count them by the size of their support
+and by their rank in the face lattice::
+
+    sage: aggregate_sign_vectors(om.covectors())
+    {0: 1, 2: 6, 3: 6}
+    sage: aggregate_sign_vectors(om.covectors(), by="rank", matrix=M)
+    {0: 1, 1: 6, 2: 6}
+    sage: plot_sign_vector_counts(om.covectors(), by="rank", matrix=M)
+    Graphics object consisting of 1 graphics primitive
+
+For a density view, we count the signs of each component::
+
+    sage: sign_density(om.covectors())
+    [5 5 5]
+    [3 3 3]
+    [5 5 5]
+    sage: plot_sign_density(om.covectors())
+    Graphics object consisting of 1 graphics primitive
+
+Sign vectors stored with :func:`~applications.binary_format.save_sign_vectors`
+are aggregated with vectorized operations on the mapped file::
+
+    sage: from applications.binary_format import save_sign_vectors, load_sign_vectors
+    sage: import os, tempfile
+    sage: path = os.path.join(tempfile.mkdtemp(), "covectors.svec")
+    sage: save_sign_vectors(path, om.covectors())
+    13
+    sage: covectors = load_sign_vectors(path)
+    sage: aggregate_sign_vectors(covectors)
+    {0: 1, 2: 6, 3: 6}
+    sage: sign_density(covectors) == sign_density(om.covectors())
+    True
+    sage: aggregate_sign_vectors(covectors, by="hamming") == aggregate_sign_vectors(list(covectors), by="hamming")
+    True
+"""
+
+#############################################################################
+#  Copyright (C) 2025                                                       #
+#          Marcus S. Aichmayr (aichmayr@mathematik.uni-kassel.de)           #
+#                                                                           #
+#  Distributed under the terms of the GNU General Public License (GPL)      #
+#  either version 3, or (at your option) any later version                  #
+#                                                                           #
+#  http://www.gnu.org/licenses/                                             #
+#############################################################################
+
+from collections import Counter
+from math import comb
+from typing import Iterator
+
+import numpy as np
+
+from sage.misc.lazy_import import lazy_import
+
+from applications.binary_format import PackedSignVectors
+from applications.bitsets import bit_indices, sign_vector_from_masks, sign_vector_masks
+
+lazy_import("sage.plot.bar_chart", "bar_chart")
+lazy_import("sage.plot.matrix_plot", "matrix_plot")
+
+AGGREGATIONS = ["support", "rank", "hamming"]
+
+# number of rows of a packed file processed at once
+_CHUNK_SIZE = 1 << 16
+
+
+def _chunks(packed: PackedSignVectors) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    for start in range(0, len(packed), _CHUNK_SIZE):
+        yield packed.positive[start:start + _CHUNK_SIZE], packed.negative[start:start + _CHUNK_SIZE]
+
+
+def _row_masks(rows: np.ndarray) -> list[int]:
+    r"""
+    Return the rows of an array of little-endian bitmask bytes as integers.
+    """
+    size = rows.shape[1]
+    if size <= 8:
+        padded = np.zeros((rows.shape[0], 8), dtype=np.uint8)
+        padded[:, :size] = rows
+        return padded.view("<u8").ravel().tolist()
+    return [int.from_bytes(row.tobytes(), "little") for row in rows]
+
+
+def _masks(sign_vectors) -> Iterator[tuple[int, int, int]]:
+    r"""
+    Yield the positive support, the negative support and the length of each sign vector.
+    """
+    if isinstance(sign_vectors, PackedSignVectors):
+        for positive, negative in _chunks(sign_vectors):
+            for masks in zip(_row_masks(positive), _row_masks(negative)):
+                yield *masks, sign_vectors.length
+        return
+    for X in sign_vectors:
+        yield *sign_vector_masks(X), len(X)
+
+
+def _distinct_masks(sign_vectors) -> Iterator[tuple[int, int, int, int]]:
+    r"""
+    Yield the supports, the length and the multiplicity of sign vectors.
+
+    For packed sign vectors, equal rows of a chunk are merged in order of their first appearance.
+    """
+    if not isinstance(sign_vectors, PackedSignVectors):
+        for masks in _masks(sign_vectors):
+            yield *masks, 1
+        return
+    size = sign_vectors.positive.shape[1]
+    for positive, negative in _chunks(sign_vectors):
+        rows, first, multiplicities = np.unique(
+            np.concatenate([positive, negative], axis=1), axis=0, return_index=True, return_counts=True
+        )
+        order = np.argsort(first)
+        rows = rows[order]
+        for masks in zip(_row_masks(rows[:, :size]), _row_masks(rows[:, size:]), multiplicities[order].tolist()):
+            yield masks[0], masks[1], sign_vectors.length, masks[2]
+
+
+def _support_counts(sign_vectors) -> tuple[Counter, int]:
+    r"""
+    Return a counter of the supports as bitmasks and the length of the sign vectors.
+    """
+    counts = Counter()
+    if isinstance(sign_vectors, PackedSignVectors):
+        for positive, negative in _chunks(sign_vectors):
+            supports, multiplicities = np.unique(positive | negative, axis=0, return_counts=True)
+            for support, multiplicity in zip(supports, multiplicities):
+                counts[int.from_bytes(support.tobytes(), "little")] += int(multiplicity)
+        return counts, sign_vectors.length
+    length = 0
+    for positive, negative, length in _masks(sign_vectors):
+        counts[positive | negative] += 1
+    return counts, length
+
+
+def _neighbors(positive: int, negative: int, length: int, radius: int, start: int = 0) -> Iterator[tuple[int, int]]:
+    r"""
+    Yield the supports of the sign vectors with at most distance ``radius``.
+    """
+    yield positive, negative
+    if radius == 0:
+        return
+    for e in range(start, length):
+        bit = 1 << e
+        cleared = (positive & ~bit, negative & ~bit)
+        for other in [cleared, (cleared[0] | bit, cleared[1]), (cleared[0], cleared[1] | bit)]:
+            if other != (positive, negative):
+                yield from _neighbors(*other, length, radius - 1, e + 1)
+
+
+def _hamming_clusters(sign_vectors, radius: int) -> dict:
+    r"""
+    Return the leaders of the clusters and the sizes of the clusters.
+
+    The leaders are stored in a dictionary.
+    If there are few sign vectors within distance ``radius``,
+    we look them up instead of comparing with each leader.
+    """
+    leaders = {}
+    order = []
+    counts = []
+    neighborhood_sizes = {}
+    for positive, negative, length, multiplicity in _distinct_masks(sign_vectors):
+        if length not in neighborhood_sizes:
+            neighborhood_sizes[length] = sum(comb(length, i) * 2**i for i in range(radius + 1))
+        if neighborhood_sizes[length] <= len(order):
+            index = min(
+                (leaders[masks] for masks in _neighbors(positive, negative, length, radius) if masks in leaders),
+                default=None,
+            )
+        else:
+            index = next(
+                (
+                    i for i, (leader_positive, leader_negative, _) in enumerate(order)
+                    if bin((positive ^ leader_positive) | (negative ^ leader_negative)).count("1") <= radius
+                ),
+                None,
+            )
+        if index is None:
+            leaders[positive, negative] = len(order)
+            order.append((positive, negative, length))
+            counts.append(multiplicity)
+        else:
+            counts[index] += multiplicity
+    return {sign_vector_from_masks(*leader): count for leader, count in zip(order, counts)}
+
+
+def aggregate_sign_vectors(sign_vectors, by: str = "support", matrix=None, radius: int = 1) -> dict:
+    r"""
+    Count sign vectors by a summary statistic.
+
+    INPUT:
+
+    - ``sign_vectors`` -- an iterable of sign vectors of the same length
+      or a :class:`~applications.binary_format.PackedSignVectors`
+
+    - ``by`` -- one of
+
+      - ``"support"`` (default) -- the size of the support,
+      - ``"rank"`` -- the rank in the face lattice of the oriented matroid given by ``matrix``,
+      - ``"hamming"`` -- clusters of sign vectors with small Hamming distance
+
+    - ``matrix`` -- a matrix whose row space has the sign vectors as covectors,
+      needed for ``by="rank"``
+
+    - ``radius`` -- the maximal Hamming distance to the leader of a cluster (default: ``1``)
+
+    OUTPUT:
+    A dictionary mapping each value of the statistic to the number of sign vectors.
+
+    The rank of a covector :math:`X` is :math:`\operatorname{rank} M - \operatorname{rank} M_Z`
+    where :math:`M_Z` consists of the columns of :math:`M` in the zero support of :math:`X`.
+    Since many covectors share their zero support, the ranks are computed once per support.
+
+    For ``by="hamming"``, each sign vector joins the first cluster
+    whose leader has at most distance ``radius``.
+    Otherwise, it becomes the leader of a new cluster.
+    The dictionary maps the leaders to the sizes of their clusters in order of appearance.
+    Once there are more leaders than sign vectors within distance ``radius`` of a sign vector,
+    these are looked up among the leaders instead of comparing with every leader.
+
+    EXAMPLES::
+
+        sage: from sign_vectors import *
+        sage: from applications.sign_vector_plots import aggregate_sign_vectors
+        sage: X = [sign_vector("++0"), sign_vector("+++"), sign_vector("--0"), sign_vector("-0-")]
+        sage: aggregate_sign_vectors(X)
+        {2: 3, 3: 1}
+        sage: aggregate_sign_vectors(X, by="hamming")
+        {(++0): 2, (--0): 1, (-0-): 1}
+        sage: aggregate_sign_vectors(X, by="hamming", radius=2)
+        {(++0): 3, (-0-): 1}
+        sage: aggregate_sign_vectors(iter(X))
+        {2: 3, 3: 1}
+
+    TESTS::
+
+        sage: aggregate_sign_vectors(X, by="rank")
+        Traceback (most recent call last):
+        ...
+        ValueError: aggregation by rank requires a matrix
+        sage: aggregate_sign_vectors(X, by="color")
+        Traceback (most recent call last):
+        ...
+        ValueError: unknown aggregation 'color'
+    """
+    if by not in AGGREGATIONS:
+        raise ValueError(f"unknown aggregation {by!r}")
+    if by == "hamming":
+        return _hamming_clusters(sign_vectors, radius)
+    if by == "rank" and matrix is None:
+        raise ValueError("aggregation by rank requires a matrix")
+
+    supports, length = _support_counts(sign_vectors)
+    counts = Counter()
+    if by == "support":
+        for support, count in supports.items():
+            counts[bin(support).count("1")] += count
+    else:
+        full = (1 << length) - 1
+        rank = matrix.rank()
+        for support, count in supports.items():
+            counts[rank - matrix.matrix_from_columns(bit_indices(full ^ support)).rank()] += count
+    return dict(sorted(counts.items()))
+
+
+def sign_density(sign_vectors):
+    r"""
+    Return the number of positive, zero and negative entries of each component.
+
+    INPUT:
+
+    - ``sign_vectors`` -- an iterable of sign vectors of the same length
+      or a :class:`~applications.binary_format.PackedSignVectors`
+
+    OUTPUT:
+    An integer matrix with three rows for the signs ``+``, ``0`` and ``-``
+    and one column for each component.
+
+    EXAMPLES::
+
+        sage: from sign_vectors import *
+        sage: from applications.sign_vector_plots import sign_density
+        sage: sign_density([sign_vector("+-0"), sign_vector("++-")])
+        [2 1 0]
+        [0 0 1]
+        [0 1 1]
+        sage: sign_density([])
+        []
+    """
+    from sage.matrix.constructor import matrix
+    from sage.rings.integer_ring import ZZ
+
+    if isinstance(sign_vectors, PackedSignVectors):
+        length = sign_vectors.length
+        positive = np.zeros(length, dtype=np.int64)
+        negative = np.zeros(length, dtype=np.int64)
+        for positive_chunk, negative_chunk in _chunks(sign_vectors):
+            positive += np.unpackbits(positive_chunk, axis=1, bitorder="little")[:, :length].sum(axis=0)
+            negative += np.unpackbits(negative_chunk, axis=1, bitorder="little")[:, :length].sum(axis=0)
+        count = len(sign_vectors)
+        positive, negative = [int(n) for n in positive], [int(n) for n in negative]
+    else:
+        length = 0
+        count = 0
+        positive, negative = [], []
+        for positive_mask, negative_mask, length in _masks(sign_vectors):
+            if not count:
+                positive, negative = [0] * length, [0] * length
+            count += 1
+            for e in bit_indices(positive_mask):
+                positive[e] += 1
+            for e in bit_indices(negative_mask):
+                negative[e] += 1
+    if not count:
+        return matrix(ZZ, 0, 0)
+    zero = [count - p - n for p, n in zip(positive, negative)]
+    return matrix(ZZ, [positive, zero, negative])
+
+
+def plot_sign_vector_counts(sign_vectors, by: str = "support", matrix=None, radius: int = 1, **kwds):
+    r"""
+    Plot the number of sign vectors for each value of a summary statistic as bar chart.
+
+    The arguments are passed to :func:`aggregate_sign_vectors`
+    and further keyword arguments to :func:`~sage.plot.bar_chart.bar_chart`.
+    For ``by="support"`` and ``by="rank"``, the bar at position :math:`k` shows the count of the value :math:`k`.
+    For ``by="hamming"``, the clusters are drawn by decreasing size.
+
+    EXAMPLES::
+
+        sage: from sign_vectors import *
+        sage: from applications.sign_vector_plots import plot_sign_vector_counts
+        sage: om = OrientedMatroid(matrix([[1, 3, -2, 1], [0, 4, -2, 1]]))
+        sage: plot_sign_vector_counts(om.vectors(), by="hamming", radius=2)
+        Graphics object consisting of 1 graphics primitive
+    """
+    counts = aggregate_sign_vectors(sign_vectors, by=by, matrix=matrix, radius=radius)
+    if by == "hamming":
+        values = sorted(counts.values(), reverse=True)
+    else:
+        values = [counts.get(k, 0) for k in range(max(counts, default=-1) + 1)]
+    return bar_chart(values, **kwds)
+
+
+def plot_sign_density(sign_vectors, **kwds):
+    r"""
+    Plot the number of positive, zero and negative entries of each component.
+
+    The rows of the plot correspond to the signs ``+``, ``0`` and ``-``,
+    the columns to the components.
+    Keyword arguments are passed to :func:`~sage.plot.matrix_plot.matrix_plot`.
+
+    .. SEEALSO::
+
+        :func:`sign_density`
+    """
+    kwds.setdefault("colorbar", True)
+    return matrix_plot(sign_density(sign_vectors), **kwds)
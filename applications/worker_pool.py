@@ -0,0 +1,420 @@
+r"""
+Warm worker pool for small sign vector computations.
+
+================
+Warm worker pool
+================
+
+Many small computations like the circuits of a :math:`3 \times 6` matrix take milliseconds,
+while starting SageMath and importing the packages
+`elementary_vectors <https://github.com/MarcusAichmayr/elementary_vectors>`_,
+`sign_vectors <https://github.com/MarcusAichmayr/sign_vectors>`_ and
+`sign_crn <https://github.com/MarcusAichmayr/sign_crn>`_ takes seconds.
+A :class:`WorkerPool` keeps processes with these packages loaded
+and accepts jobs over a Unix socket.
+Identical jobs are computed only once.
+
+We start a pool in the background::
+
+    sage: from applications.worker_pool import WorkerPool, WorkerPoolClient
+    sage: import os, tempfile, threading
+    sage: address = os.path.join(tempfile.mkdtemp(), "pool.sock")
+    sage: pool = WorkerPool(address, workers=2)
+    sage: thread = threading.Thread(target=pool.serve_forever, daemon=True)
+    sage: thread.start()
+
+A client submits jobs by the name of an operation::
+
+    sage: client = WorkerPoolClient(address)
+    sage: M = matrix([[1, 1, 2, 0], [0, 0, 1, 2]])
+    sage: client.run("circuits", M)
+    [(1, -1, 0, 0), (4, 0, -2, 1), (0, 4, -2, 1)]
+    sage: len(client.run("cocircuits", M))
+    6
+    sage: S = matrix([[1, 0, 0, 0, 0, 1], [0, 1, 0, 0, 0, -1], [0, 0, 1, 1, 2, 0]])
+    sage: St = matrix([[-1, -1, 0, 0, -2, 0], [0, 0, 1, 1, 0, 0], [0, 0, 0, 0, 1, 1]])
+    sage: client.run("face_condition", S, St)
+    True
+
+Errors are raised on the client side::
+
+    sage: client.run("unknown", M)
+    Traceback (most recent call last):
+    ...
+    ValueError: unknown operation 'unknown'
+
+If a worker process dies, the pool is replaced while the client stays connected::
+
+    sage: pool._executor.submit(os._exit, 1).exception()
+    BrokenProcessPool(...)
+    sage: client.run("circuits", matrix([[1, 2]]))
+    [(2, -1)]
+    sage: client.run("circuits", M)
+    [(1, -1, 0, 0), (4, 0, -2, 1), (0, 4, -2, 1)]
+
+Finally, we shut down the pool::
+
+    sage: client.close()
+    sage: pool.close()
+    sage: thread.join()
+
+The pool can also be started as a daemon from the command line::
+
+    $ sage -python -m applications.worker_pool /tmp/sign_vectors.sock --workers 4
+"""
+
+#############################################################################
+#  Copyright (C) 2025                                                       #
+#          Marcus S. Aichmayr (aichmayr@mathematik.uni-kassel.de)           #
+#                                                                           #
+#  Distributed under the terms of the GNU General Public License (GPL)      #
+#  either version 3, or (at your option) any later version                  #
+#                                                                           #
+#  http://www.gnu.org/licenses/                                             #
+#############################################################################
+
+import argparse
+import hashlib
+import multiprocessing
+import os
+import pickle
+import socket
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from importlib import import_module
+from multiprocessing.connection import Client, Listener
+
+#: Operations accepted by the pool.
+#: Values of the form ``"module:attribute"`` refer to functions,
+#: values of the form ``".method"`` call a method of the first argument.
+OPERATIONS = {
+    "circuits": "elementary_vectors:circuits",
+    "circuit_supports": "elementary_vectors:circuit_supports",
+    "cocircuits": "applications.worker_pool:_cocircuits",
+    "covectors": "applications.worker_pool:_covectors",
+    "non_negative_vectors": "applications.ecxs_symbolic:non_negative_vectors",
+    "uniqueness_condition": "sign_crn:uniqueness_condition",
+    "face_condition": "sign_crn:face_condition",
+    "degeneracy_condition": "sign_crn:degeneracy_condition",
+    "has_at_most_one_cbe": ".has_at_most_one_cbe",
+    "has_robust_cbe": ".has_robust_cbe",
+    "has_exactly_one_cbe": ".has_exactly_one_cbe",
+}
+
+PRELOADED_MODULES = ["sage.all", "elementary_vectors", "sign_vectors", "sign_crn"]
+
+
+def process_pool(workers: int = None, initializer=None, initargs: tuple = (), method: str = "fork") -> ProcessPoolExecutor:
+    r"""
+    Return a pool of forked worker processes.
+
+    INPUT:
+
+    - ``workers`` -- the number of processes (default: number of CPUs)
+
+    - ``initializer`` -- a function called with ``initargs`` in each process (optional)
+
+    - ``method`` -- the start method of :mod:`multiprocessing` (default: ``"fork"``)
+
+    Forked processes inherit the imported modules of the calling process.
+    Hence, they start without paying the import cost of SageMath again.
+    Also ``initargs`` are inherited and need not be picklable.
+    Forking is only safe before the calling process starts threads.
+    Otherwise, use the method ``"forkserver"`` with a picklable ``initializer``.
+
+    EXAMPLES::
+
+        sage: from applications.worker_pool import process_pool
+        sage: with process_pool(2) as executor:
+        ....:     executor.submit(factorial, 5).result()
+        120
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context(method),
+        initializer=initializer,
+        initargs=initargs,
+    )
+
+
+def _preload() -> None:
+    for module in PRELOADED_MODULES:
+        import_module(module)
+
+
+def _cocircuits(M):
+    from sign_vectors import OrientedMatroid
+
+    return OrientedMatroid(M).cocircuits()
+
+
+def _covectors(M):
+    from sign_vectors import OrientedMatroid
+
+    return OrientedMatroid(M).covectors()
+
+
+def run_operation(name: str, *args, **kwargs):
+    r"""
+    Run an operation of :data:`OPERATIONS` in the current process.
+
+    EXAMPLES::
+
+        sage: from applications.worker_pool import run_operation
+        sage: run_operation("circuits", matrix([[1, 2, 0, 0], [0, 1, 2, 3]]))
+        [(4, -2, 1, 0), (6, -3, 0, 1), (0, 0, -3, 2)]
+        sage: run_operation("has_at_most_one_cbe", 1)
+        Traceback (most recent call last):
+        ...
+        AttributeError: 'sage.rings.integer.Integer' object has no attribute 'has_at_most_one_cbe'...
+    """
+    try:
+        target = OPERATIONS[name]
+    except KeyError:
+        raise ValueError(f"unknown operation {name!r}") from None
+    if target.startswith("."):
+        element, *args = args
+        return getattr(element, target[1:])(*args, **kwargs)
+    module, attribute = target.split(":")
+    return getattr(import_module(module), attribute)(*args, **kwargs)
+
+
+def _run_pickled(job: bytes):
+    name, args, kwargs = pickle.loads(job)
+    return run_operation(name, *args, **kwargs)
+
+
+def _key_path(address: str) -> str:
+    return address + ".key"
+
+
+def _failed(future: Future) -> bool:
+    return future.done() and (future.cancelled() or future.exception() is not None)
+
+
+class WorkerPool:
+    r"""
+    A pool of warm SageMath processes serving jobs over a Unix socket.
+
+    INPUT:
+
+    - ``address`` -- path of the Unix socket
+
+    - ``workers`` -- the number of worker processes (default: number of CPUs)
+
+    - ``authkey`` -- a key clients authenticate with;
+      by default, a random key is generated and stored next to the socket
+
+    - ``cache_size`` -- the number of finished jobs to keep for deduplication (default: ``1024``)
+
+    Jobs with identical pickled requests are computed only once.
+    While a job is running, duplicate requests wait for the same result.
+    Failed jobs are not cached.
+    If a worker process dies, for instance by a segmentation fault,
+    the pool of worker processes is replaced.
+    Since connections are handled in threads by then,
+    the new processes are forked from a fork server that has imported :data:`PRELOADED_MODULES`.
+    As usual for :mod:`multiprocessing`, a script starting the pool
+    needs an ``if __name__ == "__main__":`` guard.
+
+    .. SEEALSO::
+
+        :class:`WorkerPoolClient`
+    """
+
+    def __init__(self, address: str, workers: int = None, authkey: bytes = None, cache_size: int = 1024) -> None:
+        if authkey is None:
+            authkey = os.urandom(32)
+            with open(os.open(_key_path(address), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb") as file:
+                file.write(authkey)
+        self.address = address
+        self._authkey = authkey
+        self._cache_size = cache_size
+        self._workers = workers
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._closed = False
+
+        _preload()
+        # start all workers now, before any connection threads exist
+        self._executor = process_pool(workers)
+        self._executor.submit(_preload).result()
+        self._listener = Listener(address, family="AF_UNIX", authkey=authkey)
+        os.chmod(address, 0o600)
+
+    def _restart_workers(self) -> None:
+        # called from connection threads, where forking this process is unsafe
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(PRELOADED_MODULES)
+        self._executor = process_pool(self._workers, initializer=_preload, method="forkserver")
+
+    def submit(self, job: bytes) -> Future:
+        r"""
+        Submit a pickled job ``(name, args, kwargs)`` and return a future for its result.
+
+        EXAMPLES::
+
+            sage: from applications.worker_pool import WorkerPool
+            sage: import os, pickle, tempfile
+            sage: pool = WorkerPool(os.path.join(tempfile.mkdtemp(), "pool.sock"), workers=1)
+            sage: job = pickle.dumps(("circuits", (matrix([[1, 1]]),), {}))
+            sage: pool.submit(job) is pool.submit(job)
+            True
+            sage: pool.submit(job).result()
+            [(1, -1)]
+
+        Failed jobs are computed again::
+
+            sage: bad = pickle.dumps(("circuits", (None,), {}))
+            sage: future = pool.submit(bad)
+            sage: future.exception() is not None
+            True
+            sage: pool.submit(bad) is future
+            False
+
+        The pool recovers from crashed workers::
+
+            sage: pool._executor.submit(os._exit, 1).exception()
+            BrokenProcessPool(...)
+            sage: pool.submit(job) is pool.submit(job)
+            True
+            sage: pool.submit(pickle.dumps(("circuits", (matrix([[1, 2]]),), {}))).result()
+            [(2, -1)]
+            sage: pool.close()
+        """
+        key = hashlib.sha256(job).digest()
+        with self._lock:
+            future = self._jobs.get(key)
+            if future is not None and not _failed(future):
+                self._jobs.move_to_end(key)
+                return future
+            try:
+                future = self._executor.submit(_run_pickled, job)
+            except BrokenProcessPool:
+                self._restart_workers()
+                future = self._executor.submit(_run_pickled, job)
+            self._jobs[key] = future
+            while len(self._jobs) > self._cache_size:
+                oldest = next(iter(self._jobs))
+                if not self._jobs[oldest].done():
+                    break
+                del self._jobs[oldest]
+            return future
+
+    def serve_forever(self) -> None:
+        r"""
+        Accept connections until :meth:`close` is called.
+
+        Each connection is handled in its own thread.
+        """
+        while True:
+            try:
+                connection = self._listener.accept()
+            except (multiprocessing.AuthenticationError, EOFError, OSError):
+                if self._closed:
+                    break
+                continue
+            if self._closed:
+                connection.close()
+                break
+            threading.Thread(target=self._handle, args=(connection,), daemon=True).start()
+
+    def _handle(self, connection) -> None:
+        with connection:
+            while True:
+                try:
+                    job = connection.recv_bytes()
+                except (EOFError, OSError):
+                    return
+                try:
+                    connection.send(("ok", self.submit(job).result()))
+                except Exception as e:
+                    connection.send(("error", e))
+
+    def close(self) -> None:
+        r"""
+        Stop serving and shut down the worker processes.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        # wake up a pending ``accept``
+        with socket.socket(socket.AF_UNIX) as wakeup:
+            try:
+                wakeup.connect(self.address)
+            except OSError:
+                pass
+        self._listener.close()
+        self._executor.shutdown(cancel_futures=True)
+        if os.path.exists(_key_path(self.address)):
+            os.remove(_key_path(self.address))
+
+
+class WorkerPoolClient:
+    r"""
+    A client of a :class:`WorkerPool`.
+
+    INPUT:
+
+    - ``address`` -- path of the Unix socket
+
+    - ``authkey`` -- the key of the pool;
+      by default, the key stored next to the socket is used
+
+    .. SEEALSO::
+
+        :class:`WorkerPool`
+    """
+
+    def __init__(self, address: str, authkey: bytes = None) -> None:
+        if authkey is None:
+            with open(_key_path(address), "rb") as file:
+                authkey = file.read()
+        self._connection = Client(address, family="AF_UNIX", authkey=authkey)
+
+    def run(self, name: str, *args, **kwargs):
+        r"""
+        Run an operation of :data:`OPERATIONS` on the pool and return its result.
+        """
+        self._connection.send_bytes(pickle.dumps((name, args, kwargs)))
+        status, value = self._connection.recv()
+        if status == "error":
+            raise value
+        return value
+
+    def close(self) -> None:
+        r"""
+        Close the connection to the pool.
+        """
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def main(argv: list[str] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m applications.worker_pool",
+        description="Serve sign vector computations from warm SageMath processes.",
+    )
+    parser.add_argument("address", help="path of the Unix socket")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    args = parser.parse_args(argv)
+
+    pool = WorkerPool(args.address, workers=args.workers)
+    try:
+        pool.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()